@@ -0,0 +1,289 @@
+"""
+Offline benchmark harness.
+
+Runs the word selector, the message formatter and an end-to-end delivery
+against local OpenRouter and Telegram stand-ins, then writes the timings as
+JSON so results can be compared between commits:
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from .stubs import OpenRouterStub, OpenRouterStubConfig, TelegramStub, TelegramStubConfig
+
+
+def _summarize(samples: List[float], **extra) -> dict:
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        **extra,
+    }
+
+
+def _time_async(factory: Callable, repeat: int) -> List[float]:
+    async def measure() -> List[float]:
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await factory()
+            samples.append(time.perf_counter() - started)
+        return samples
+
+    return asyncio.run(measure())
+
+
+def _write_dictionary(path: str, lines: int) -> None:
+    rng = random.Random(lines)
+    letters = string.ascii_lowercase
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(lines):
+            # Roughly one line in ten fails the selector's filter
+            if i % 10 == 0:
+                f.write(f"{rng.choice(letters)}'{i}\n")
+            else:
+                f.write("".join(rng.choices(letters, k=rng.randint(3, 14))) + "\n")
+
+
+def bench_word_selector(sizes: List[int], repeat: int, workdir: str) -> Dict[str, dict]:
+    from src.utils.word_selector import WordSelector
+
+    results = {}
+    for size in sizes:
+        words_path = os.path.join(workdir, f"words-{size}")
+        _write_dictionary(words_path, size)
+        selector = WordSelector(words_path, os.path.join(workdir, f"words-{size}.idx"))
+
+        cold = _time_async(lambda: selector.get_random_words(2), 1)
+        warm = _time_async(lambda: selector.get_random_words(2), repeat)
+
+        # A fresh selector reuses the index on disk, as a new cron run would
+        restart = WordSelector(words_path, selector.index.index_path)
+        reopen = _time_async(lambda: restart.get_random_words(2), 1)
+
+        results[f"word_selector.build_index.{size}"] = _summarize(cold, lines=size)
+        results[f"word_selector.open_index.{size}"] = _summarize(reopen, lines=size)
+        results[f"word_selector.sample.{size}"] = _summarize(warm, lines=size)
+    return results
+
+
+def _synthetic_response(target_length: int) -> str:
+    sections = []
+    while sum(len(section) for section in sections) < target_length:
+        n = len(sections)
+        sections.append(
+            f"## Section {n}\n\n**Word{n}** (noun): a *placeholder* definition with "
+            f"some_markup, [brackets] and punctuation! Example: \"use word{n} well.\"\n"
+        )
+    return "\n".join(sections)
+
+
+def bench_formatter(lengths: List[int], repeat: int) -> Dict[str, dict]:
+    from src.bot.message_formatter import MessageFormatter
+
+    formatter = MessageFormatter()
+    results = {}
+    for length in lengths:
+        text = _synthetic_response(length)
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            formatter.build_payload(formatter.format_daily_words_message(text))
+            samples.append(time.perf_counter() - started)
+        results[f"formatter.format.{length}"] = _summarize(samples, chars=len(text))
+    return results
+
+
+def bench_end_to_end(args: argparse.Namespace, workdir: str) -> Dict[str, dict]:
+    openrouter = OpenRouterStub(OpenRouterStubConfig(
+        latency_seconds=args.ai_latency,
+        latency_jitter_seconds=args.ai_jitter,
+        failure_rate=args.ai_failure_rate,
+    ))
+    telegram = TelegramStub(TelegramStubConfig(
+        latency_seconds=args.telegram_latency,
+        rate_limit_rate=args.telegram_429_rate,
+        retry_after_seconds=args.telegram_retry_after,
+    ))
+
+    words_path = os.path.join(workdir, "words-e2e")
+    _write_dictionary(words_path, 10_000)
+
+    with openrouter, telegram:
+        os.environ.update({
+            "TELEGRAM_BOT_TOKEN": "123456:bench",
+            "OPENROUTER_API_KEY": "bench",
+            "OPENROUTER_BASE_URL": f"{openrouter.url}/api/v1",
+            "TELEGRAM_BASE_URL": f"{telegram.url}/bot",
+            "TELEGRAM_CHAT_IDS_STR": ",".join(str(1000 + i) for i in range(args.chats)),
+            "WORDS_FILE_PATH": words_path,
+            "WORD_INDEX_PATH": os.path.join(workdir, "words-e2e.idx"),
+            "MODEL_STATS_PATH": os.path.join(workdir, "model_stats.json"),
+            "CONTENT_CACHE_PATH": os.path.join(workdir, "content_cache.json"),
+            "HISTORY_DB_PATH": os.path.join(workdir, "history.sqlite3"),
+            "DELIVERY_JOURNAL_DIR": os.path.join(workdir, "journal"),
+            "CONTENT_POOL_PATH": os.path.join(workdir, "content_pool.json"),
+            "PROMPT_STATS_PATH": os.path.join(workdir, "prompt_stats.json"),
+        })
+
+        from main import RandomWordBot
+        from src.config.settings import get_settings
+
+        get_settings.cache_clear()
+
+        async def run_once() -> None:
+            # Always exercise live generation rather than the cache
+            try:
+                os.remove(os.environ["CONTENT_CACHE_PATH"])
+            except FileNotFoundError:
+                pass
+            bot = RandomWordBot()
+            try:
+                await bot.deliver()
+            finally:
+                await bot.close()
+
+        samples = []
+        failures = 0
+        for _ in range(args.repeat_e2e):
+            started = time.perf_counter()
+            try:
+                asyncio.run(run_once())
+            except Exception:
+                failures += 1
+            samples.append(time.perf_counter() - started)
+
+        return {
+            f"end_to_end.deliver.{args.chats}_chats": _summarize(
+                samples,
+                chats=args.chats,
+                failed_runs=failures,
+                ai_requests=openrouter.requests,
+                telegram_requests=telegram.requests,
+                telegram_rate_limited=telegram.rate_limited,
+            )
+        }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _compare(results: Dict[str, dict], baseline_path: str) -> None:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"\nCompared with {baseline_path} ({baseline['meta']['commit']}):")
+    for name, current in sorted(results.items()):
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"  {name:<45} {current['median_ms']:>10.3f} ms  (new)")
+            continue
+        change = (current["median_ms"] - previous["median_ms"]) / max(previous["median_ms"], 1e-9)
+        print(
+            f"  {name:<45} {previous['median_ms']:>10.3f} -> {current['median_ms']:>10.3f} ms"
+            f"  ({change:+.1%})"
+        )
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write results")
+    parser.add_argument("--compare", help="Baseline results file to compare against")
+    parser.add_argument(
+        "--suites", default="words,formatter,e2e",
+        help="Comma-separated suites to run: words, formatter, e2e",
+    )
+    parser.add_argument(
+        "--dict-sizes", type=_int_list, default=[100_000, 1_000_000],
+        help="Synthetic dictionary sizes in lines (e.g. 100000,1000000,10000000)",
+    )
+    parser.add_argument(
+        "--response-sizes", type=_int_list, default=[4_000, 40_000, 400_000],
+        help="Synthetic AI response sizes in characters",
+    )
+    parser.add_argument("--repeat", type=int, default=50, help="Repetitions for micro benchmarks")
+    parser.add_argument("--repeat-e2e", type=int, default=3, help="End-to-end repetitions")
+    parser.add_argument("--chats", type=int, default=200, help="Subscribers in the end-to-end run")
+    parser.add_argument("--ai-latency", type=float, default=0.5, help="Stub AI latency in seconds")
+    parser.add_argument("--ai-jitter", type=float, default=0.0, help="Extra random AI latency")
+    parser.add_argument("--ai-failure-rate", type=float, default=0.0, help="Stub AI failure rate")
+    parser.add_argument(
+        "--telegram-latency", type=float, default=0.02, help="Stub Telegram latency in seconds"
+    )
+    parser.add_argument(
+        "--telegram-429-rate", type=float, default=0.0, help="Fraction of sends answered with 429"
+    )
+    parser.add_argument(
+        "--telegram-retry-after", type=int, default=1, help="retry_after sent with stub 429s"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    suites = {suite.strip() for suite in args.suites.split(",")}
+
+    from src.utils.logging import configure_logging
+
+    configure_logging("ERROR")
+
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="rwb-bench-") as workdir:
+        if "words" in suites:
+            results.update(bench_word_selector(args.dict_sizes, args.repeat, workdir))
+        if "formatter" in suites:
+            results.update(bench_formatter(args.response_sizes, args.repeat))
+        if "e2e" in suites:
+            results.update(bench_end_to_end(args, workdir))
+
+    output = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {key: value for key, value in vars(args).items() if key != "compare"},
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+
+    for name, summary in sorted(results.items()):
+        print(f"{name:<45} median {summary['median_ms']:>10.3f} ms  p95 {summary['p95_ms']:>10.3f} ms")
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
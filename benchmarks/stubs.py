@@ -0,0 +1,224 @@
+"""Local stand-ins for the OpenRouter and Telegram HTTP APIs."""
+
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs
+
+
+@dataclass
+class OpenRouterStubConfig:
+    latency_seconds: float = 0.2
+    latency_jitter_seconds: float = 0.0
+    failure_rate: float = 0.0
+    response_text: str = "**Today's theme**\n\nA stub response.\n\nBy Light (@justanotherlight)"
+    stream_chunk_size: int = 16
+
+
+@dataclass
+class TelegramStubConfig:
+    latency_seconds: float = 0.02
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+
+
+class _StubServer:
+    """Runs a ThreadingHTTPServer on a free local port in a background thread."""
+
+    handler_class = BaseHTTPRequestHandler
+
+    def __init__(self, config):
+        self.config = config
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def count(self, attribute: str) -> None:
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def start(self) -> "_StubServer":
+        stub = self
+
+        class Handler(self.handler_class):
+            server_stub = stub
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _read_body(handler: BaseHTTPRequestHandler) -> dict:
+    length = int(handler.headers.get("Content-Length") or 0)
+    raw = handler.rfile.read(length) if length else b""
+    if not raw:
+        return {}
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return {key: values[-1] for key, values in parse_qs(raw.decode()).items()}
+
+
+def _send_json(handler: BaseHTTPRequestHandler, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode()
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def _completion_text(request: dict, config: OpenRouterStubConfig) -> str:
+    """Answer structured-output prompts with schema-conforming JSON."""
+    prompt = request.get("messages", [{}])[-1].get("content", "")
+    count = re.search(r'"words" must hold exactly (\d+) entries', prompt)
+    if count is None:
+        return config.response_text
+
+    content = {
+        "theme": "A stub theme.",
+        "words": [
+            {"word": f"stubword{n}", "part_of_speech": "noun", "definition": "A stub definition."}
+            for n in range(int(count.group(1)))
+        ],
+    }
+    language = re.search(r'"language": "([^"]+)"', prompt)
+    if language is not None:
+        content["language_word"] = {
+            "language": language.group(1),
+            "word": "stub",
+            "pronunciation": "stub",
+            "part_of_speech": "noun",
+            "meaning": "stub",
+        }
+    return json.dumps(content)
+
+
+class _OpenRouterHandler(BaseHTTPRequestHandler):
+    server_stub: "OpenRouterStub"
+
+    def do_POST(self):
+        config = self.server_stub.config
+        self.server_stub.count_request()
+        request = _read_body(self)
+        time.sleep(config.latency_seconds + random.uniform(0, config.latency_jitter_seconds))
+
+        if random.random() < config.failure_rate:
+            _send_json(self, 503, {"error": {"message": "stub failure", "code": 503}})
+            return
+
+        model = request.get("model", "stub-model")
+        text = _completion_text(request, config)
+        if request.get("stream"):
+            self._stream(model, text, config)
+            return
+
+        _send_json(self, 200, {
+            "id": "stub-completion",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": text},
+            }],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 200, "total_tokens": 300},
+        })
+
+    def _stream(self, model: str, text: str, config: OpenRouterStubConfig) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for start in range(0, len(text), config.stream_chunk_size):
+            chunk = {
+                "id": "stub-completion",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": text[start:start + config.stream_chunk_size]},
+                    "finish_reason": None,
+                }],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+class _TelegramHandler(BaseHTTPRequestHandler):
+    server_stub: "TelegramStub"
+
+    def do_POST(self):
+        config = self.server_stub.config
+        self.server_stub.count_request()
+        request = _read_body(self)
+        time.sleep(config.latency_seconds)
+
+        if random.random() < config.rate_limit_rate:
+            self.server_stub.count("rate_limited")
+            _send_json(self, 429, {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {config.retry_after_seconds}",
+                "parameters": {"retry_after": config.retry_after_seconds},
+            })
+            return
+
+        chat_id = int(request.get("chat_id", 0))
+        _send_json(self, 200, {
+            "ok": True,
+            "result": {
+                "message_id": self.server_stub.requests,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": request.get("text", ""),
+            },
+        })
+
+
+class OpenRouterStub(_StubServer):
+    """Emulates the OpenRouter chat completions endpoint."""
+
+    handler_class = _OpenRouterHandler
+
+
+class TelegramStub(_StubServer):
+    """Emulates the Telegram Bot API sendMessage endpoint."""
+
+    handler_class = _TelegramHandler
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.rate_limited = 0
@@ -1,78 +1,858 @@
+import time
+
+_STARTED_AT = time.perf_counter()
+
+import argparse
 import asyncio
+import datetime
+import multiprocessing
+import signal
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from src.utils.startup_profile import StartupProfiler
 
-from src.config.settings import settings
-from src.utils.logging import configure_logging, get_logger
-from src.utils.exceptions import RandomWordBotError, ConfigurationError
+# Installed before the application imports below so they are measured too
+startup_profiler = (
+    StartupProfiler(_STARTED_AT).install() if "--profile-startup" in sys.argv else None
+)
+
+from src.config.settings import get_settings
+from src.utils.logging import configure_logging, get_logger, logging_stats, parse_event_limits
+from src.utils.exceptions import (
+    RandomWordBotError,
+    ConfigurationError,
+    DeadlineExceededError,
+    TelegramBotError,
+)
 from src.ai.openrouter_client import OpenRouterClient
+from src.ai.content import load_content
+from src.ai.prompt_stats import PromptStatsStore
+from src.ai.variants import ContentVariant
+from src.utils.coalescer import Coalescer
+from src.utils.content_cache import CachedContent, ContentCache
+from src.utils.deadline import (
+    AI_GENERATION,
+    DELIVERY,
+    WORD_SELECTION,
+    Deadline,
+    parse_stage_budgets,
+)
+from src.utils.history import THEME, VOCABULARY, WordHistory, extract_vocabulary_words
+from src.utils.metrics import metrics
 from src.utils.word_selector import WordSelector
+from src.utils.word_weights import parse_difficulty_bands
 from src.bot.telegram_client import TelegramClient
-from src.bot.message_formatter import MessageFormatter
+from src.bot.content_pool import ContentPool
+from src.bot.delivery import DeliveryReport
+from src.bot.interactive import InteractiveBot
+from src.bot.journal import DeliveryJournal, prune_journals
+from src.bot.message_formatter import MessageFormatter, MessagePayload
+from src.bot.preferences import ChatPreferences
+from src.bot.subscribers import ShardSpec, open_subscriber_source
+from src.bot.scheduler import DeliveryScheduler, parse_delivery_slots
 
 
 logger = get_logger(__name__)
 
 
+def vocabulary_words(ai_response: str) -> List[str]:
+    """Vocabulary words of structured content, or as extracted from free text."""
+    content = load_content(ai_response)
+    return content.vocabulary() if content is not None else extract_vocabulary_words(ai_response)
+
+
 class RandomWordBot:
     """Main bot orchestrator."""
-    
-    def __init__(self):
-        self.word_selector = WordSelector(settings.words_file_path)
+
+    def __init__(self, shard: Optional[ShardSpec] = None):
+        """
+        Args:
+            shard: Slice of the subscribers this process delivers to, defaults to all
+        """
+        settings = get_settings()
+        self.shard = shard or ShardSpec()
+        self.word_selector = WordSelector(
+            settings.words_file_path,
+            settings.word_index_path,
+            frequency_path=settings.word_frequency_file_path,
+            difficulty_bands=parse_difficulty_bands(settings.word_difficulty_bands_str),
+            default_difficulty=settings.word_difficulty,
+            frequency_exponent=settings.word_frequency_exponent,
+        )
         self.ai_client = OpenRouterClient()
-        self.telegram_client = TelegramClient()
+        self.telegram_client = TelegramClient(rate_share=1.0 / self.shard.count)
+        self.subscribers = open_subscriber_source(settings)
+        self.preferences = ChatPreferences(
+            settings.chat_preferences_path, ContentVariant.from_settings(settings)
+        )
         self.message_formatter = MessageFormatter()
-    
-    async def run(self) -> None:
-        """Run the daily word generation and sending process."""
+        self.content_cache = ContentCache(
+            settings.content_cache_path,
+            settings.content_cache_ttl_days,
+            settings.content_cache_max_entries,
+        )
+        self.history = WordHistory(settings.history_db_path, settings.history_window_days)
+        prune_journals(settings.delivery_journal_dir, settings.delivery_journal_retention_days)
+        self._journals: Dict[datetime.date, DeliveryJournal] = {}
+        # Identical variants in flight are generated once; distinct ones run
+        # concurrently up to AI_MAX_CONCURRENT_GENERATIONS
+        self._content_requests = Coalescer("content")
+        self._generation_slots = asyncio.Semaphore(settings.ai_max_concurrent_generations)
+        self._cache_reloaded_at = 0.0
+        # Served on demand in interactive mode, and a last resort when a run
+        # is out of time
+        self.content_pool = ContentPool(
+            settings.content_pool_path,
+            self.generate_pool_content,
+            capacity=settings.content_pool_size,
+            low_water=settings.content_pool_low_water,
+            max_age_seconds=settings.content_pool_max_age_hours * 3600,
+        )
+
+    async def generate_content(
+        self,
+        for_date: datetime.date,
+        variant: Optional[ContentVariant] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> str:
+        """
+        Select theme words, generate ``variant`` content for ``for_date`` and cache it.
+
+        Theme words used recently are skipped, and the content is regenerated
+        (up to HISTORY_MAX_REGENERATIONS times, time permitting) if it repeats
+        vocabulary words.
+
+        Raises:
+            DeadlineExceededError: If word selection or generation runs out of its budget
+        """
+        settings = get_settings()
+        variant = variant or self.preferences.default
+        ai_deadline = deadline.stage(AI_GENERATION) if deadline is not None else None
+        logger.info("Selecting random words", count=2)
+        with metrics.span("word_selection"):
+            try:
+                random_words = await asyncio.wait_for(
+                    self.word_selector.get_random_words(
+                        2, exclude=self.history.recent(THEME), difficulty=variant.difficulty
+                    ),
+                    deadline.stage(WORD_SELECTION).remaining() if deadline is not None else None,
+                )
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError("Word selection ran out of time")
+        logger.info("Selected random words", words=random_words)
+
+        logger.info("Generating daily words with AI", date=for_date.isoformat(), variant=variant.key)
+        with metrics.span("ai_generation"):
+            ai_response = await self.ai_client.generate_daily_words(
+                random_words, for_date, variant=variant, deadline=ai_deadline
+            )
+
+        vocabulary = vocabulary_words(ai_response)
+        repeats = self.history.find_repeats(vocabulary, VOCABULARY)
+        for _ in range(settings.history_max_regenerations):
+            if not repeats:
+                break
+            if ai_deadline is not None and ai_deadline.remaining() < settings.deadline_min_ai_seconds:
+                logger.info("No time left to regenerate repeated vocabulary", repeats=repeats)
+                break
+            metrics.inc("vocabulary_repeats", len(repeats), help="Generated vocabulary words used before")
+            logger.info("Regenerating content with repeated vocabulary", repeats=repeats)
+            avoid_words = repeats + [
+                word
+                for word in self.history.latest(VOCABULARY, settings.history_prompt_avoid_limit)
+                if word not in repeats
+            ]
+            with metrics.span("ai_generation"):
+                try:
+                    ai_response = await self.ai_client.generate_daily_words(
+                        random_words, for_date, avoid_words, variant, ai_deadline
+                    )
+                except DeadlineExceededError:
+                    # The first answer is still good enough to send
+                    break
+            vocabulary = vocabulary_words(ai_response)
+            repeats = self.history.find_repeats(vocabulary, VOCABULARY)
+
+        if repeats:
+            logger.warning("Using content with repeated vocabulary", repeats=repeats)
+
+        self.history.record(random_words, THEME, for_date)
+        self.history.record(vocabulary, VOCABULARY, for_date)
+        self.content_cache.put(for_date, random_words, ai_response, variant.key)
+        return ai_response
+
+    async def generate_pool_content(self) -> str:
+        """Generate one extra set of default-variant words for the on-demand pool."""
+        variant = self.preferences.default
+        random_words = await self.word_selector.get_random_words(
+            2, exclude=self.history.recent(THEME), difficulty=variant.difficulty
+        )
+        async with self._generation_slots:
+            with metrics.span("ai_generation"):
+                return await self.ai_client.generate_daily_words(random_words, variant=variant)
+
+    def cached_content_for(self, chat_id: int) -> Optional[str]:
+        """Today's cached content for a chat's variant, without generating it."""
+        today = datetime.date.today()
+        key = self.preferences.variant_for(chat_id).key
+        cached = self.content_cache.get(today, key)
+        if cached is None and time.monotonic() - self._cache_reloaded_at > 60:
+            # The daily run or --pregenerate may have cached it from another process
+            self.content_cache.reload()
+            self._cache_reloaded_at = time.monotonic()
+            cached = self.content_cache.get(today, key)
+        return cached.content if cached is not None else None
+
+    async def run_interactive(self) -> None:
+        """Answer /today, /word and /more until stopped, from cached and pooled content."""
+        settings = get_settings()
+        interactive = InteractiveBot(
+            self.cached_content_for,
+            self.content_pool,
+            self.message_formatter,
+            settings.interactive_cooldown_seconds,
+        )
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
         try:
-            logger.info("Starting Random Word Bot")
-            
-            # Get random words for theme
-            logger.info("Selecting random words", count=2)
-            random_words = await self.word_selector.get_random_words(2)
-            logger.info("Selected random words", words=random_words)
-            
-            # Generate daily words using AI
-            logger.info("Generating daily words with AI")
-            ai_response = await self.ai_client.generate_daily_words(random_words)
-            
-            # Format message
-            logger.info("Formatting message")
+            await interactive.run(stop)
+        finally:
+            await self.close()
+
+    async def pregenerate(self, days: int) -> None:
+        """Generate and cache every content variant for today and the following days."""
+        today = datetime.date.today()
+        variants = self.preferences.variants()
+        for offset in range(days):
+            day = today + datetime.timedelta(days=offset)
+            await self.ensure_content(day, variants)
+            logger.info("Pregenerated content", date=day.isoformat(), variants=len(variants))
+
+    def journal(self, for_date: datetime.date) -> DeliveryJournal:
+        """Return the delivery journal for ``for_date``, replaying it on first use."""
+        journal = self._journals.get(for_date)
+        if journal is None:
+            journal = DeliveryJournal(
+                get_settings().delivery_journal_dir,
+                for_date,
+                self.shard.name if self.shard.count > 1 else None,
+            )
+            # A daemon only ever needs the journals of the last day or two
+            for stale in [day for day in self._journals if day < for_date - datetime.timedelta(days=1)]:
+                del self._journals[stale]
+            self._journals[for_date] = journal
+        return journal
+
+    async def ensure_content(
+        self,
+        for_date: datetime.date,
+        variants: List[ContentVariant],
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        """Make sure every variant in ``variants`` is cached for ``for_date``."""
+        await asyncio.gather(*(self.content(for_date, variant, deadline) for variant in variants))
+
+    async def content(
+        self, for_date: datetime.date, variant: ContentVariant, deadline: Optional[Deadline] = None
+    ) -> str:
+        """
+        Return the ``variant`` content for ``for_date``, resolving each distinct
+        variant once however many callers ask for it concurrently.
+        """
+
+        async def resolve() -> str:
+            async with self._generation_slots:
+                return await self.resolve_content(for_date, variant, deadline)
+
+        return await self._content_requests.run((for_date, variant.key), resolve)
+
+    async def resolve_content(
+        self, for_date: datetime.date, variant: ContentVariant, deadline: Optional[Deadline] = None
+    ) -> str:
+        """
+        Return the ``variant`` content for ``for_date`` from the cache, generating it on a miss.
+
+        Shards other than 0 never generate: they wait for the content shard 0
+        (or a --pregenerate run) caches, so every shard sends the same message.
+        When ``deadline`` leaves too little time to generate, content that has
+        not been sent yet is used instead if there is any; otherwise the
+        content is generated (or waited for) past the deadline.
+
+        Raises:
+            RandomWordBotError: If content cannot be produced
+        """
+        # A --pregenerate run may have cached it since this process started
+        self.content_cache.reload()
+        cached = self.content_cache.get(for_date, variant.key)
+        if cached is None and self.shard.index > 0:
+            try:
+                cached = await self._wait_for_shared_content(for_date, variant, deadline)
+            except DeadlineExceededError:
+                fallback = self._fallback_content(for_date, variant)
+                if fallback is not None:
+                    return fallback
+                cached = await self._wait_for_shared_content(for_date, variant)
+
+        if cached is not None:
+            metrics.inc("content_cache_hits", help="Deliveries served from the content cache")
+            logger.info(
+                "Using pregenerated content",
+                date=cached.date,
+                variant=variant.key,
+                words=cached.theme_words,
+            )
+            return cached.content
+
+        metrics.inc("content_cache_misses", help="Deliveries that needed live generation")
+        if deadline is not None:
+            budget = deadline.stage(AI_GENERATION).remaining()
+            if budget < get_settings().deadline_min_ai_seconds:
+                logger.warning(
+                    "Not enough time to generate content", budget_seconds=round(budget, 3)
+                )
+                return await self._late_content(for_date, variant)
+
+        logger.info(
+            "No pregenerated content, generating live", date=for_date.isoformat(), variant=variant.key
+        )
+        try:
+            return await self.generate_content(for_date, variant, deadline)
+        except DeadlineExceededError as e:
+            logger.warning("Content generation ran out of time", error=str(e))
+            return await self._late_content(for_date, variant)
+
+    async def _late_content(self, for_date: datetime.date, variant: ContentVariant) -> str:
+        """Unsent fallback content if there is any, else live content regardless of the deadline."""
+        fallback = self._fallback_content(for_date, variant)
+        if fallback is not None:
+            return fallback
+
+        metrics.inc("deadline_overruns", help="Runs that generated content past the deadline")
+        logger.warning(
+            "No unsent content to fall back on, generating past the deadline",
+            date=for_date.isoformat(),
+            variant=variant.key,
+        )
+        return await self.generate_content(for_date, variant)
+
+    def _fallback_content(self, for_date: datetime.date, variant: ContentVariant) -> Optional[str]:
+        """
+        Content that has not been sent yet, for runs that are out of time.
+
+        Tries content pregenerated for a later day in the chat's variant,
+        then the on-demand content pool, then later content in the default
+        variant. Content from earlier days is never used, since the same
+        chats have most likely received it already.
+        """
+        upcoming = self.content_cache.take_upcoming(for_date, variant.key)
+        if upcoming is None:
+            pooled = self.content_pool.take()
+            if pooled is not None:
+                metrics.inc("deadline_fallbacks", help="Runs that sent earlier content", source="pool")
+                logger.warning("Sending pooled content to meet the deadline", variant=variant.key)
+                return pooled
+            if variant.key != self.preferences.default.key:
+                upcoming = self.content_cache.take_upcoming(for_date, self.preferences.default.key)
+        if upcoming is None:
+            return None
+
+        metrics.inc("deadline_fallbacks", help="Runs that sent earlier content", source="cache")
+        logger.warning(
+            "Sending content pregenerated for a later day to meet the deadline",
+            variant=upcoming.variant,
+            words=upcoming.theme_words,
+        )
+        return upcoming.content
+
+    async def _wait_for_shared_content(
+        self,
+        for_date: datetime.date,
+        variant: ContentVariant,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[CachedContent]:
+        wait_seconds = get_settings().shard_content_wait_seconds
+        if deadline is not None:
+            wait_seconds = min(wait_seconds, deadline.stage(AI_GENERATION).remaining())
+        wait_until = time.monotonic() + wait_seconds
+        logger.info("Waiting for shared content", shard=self.shard.name, date=for_date.isoformat())
+        while time.monotonic() < wait_until:
+            await asyncio.sleep(min(1.0, max(0.0, wait_until - time.monotonic())))
+            self.content_cache.reload()
+            cached = self.content_cache.get(for_date, variant.key)
+            if cached is not None:
+                return cached
+        if deadline is not None and wait_seconds < get_settings().shard_content_wait_seconds:
+            raise DeadlineExceededError(f"Shared content for {variant.key} was not cached in time")
+        raise RandomWordBotError(
+            f"Content for {for_date.isoformat()} ({variant.key}) was not cached within "
+            f"{get_settings().shard_content_wait_seconds:.0f}s"
+        )
+
+    async def _build_payload(
+        self,
+        for_date: datetime.date,
+        variant: ContentVariant,
+        journal: DeliveryJournal,
+        deadline: Optional[Deadline] = None,
+    ) -> MessagePayload:
+        ai_response = journal.content_for(variant.key)
+        if ai_response is not None:
+            logger.info("Using journaled content", date=for_date.isoformat(), variant=variant.key)
+        else:
+            ai_response = await self.content(for_date, variant, deadline)
+            # Concurrent slots for the same date share the journal
+            if journal.content_for(variant.key) is None:
+                journal.record_content(ai_response, variant.key)
+
+        # Format message
+        logger.info("Formatting message")
+        with metrics.span("formatting"):
             message = self.message_formatter.format_daily_words_message(ai_response)
-            
-            # Send to Telegram
-            logger.info("Sending message to Telegram")
-            await self.telegram_client.send_message(message)
-            
+            return self.message_formatter.build_payload(message)
+
+    async def deliver(
+        self,
+        chat_ids: Optional[List[int]] = None,
+        for_date: Optional[datetime.date] = None,
+        resume: bool = False,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        """
+        Deliver the content for ``for_date`` to ``chat_ids``.
+
+        Without explicit chat IDs, subscribers are streamed from the configured
+        source in batches. Only chats belonging to this process's shard are
+        sent to. The content and every chat's outcome are written to the date's
+        delivery journal as they happen. With ``resume``, the journaled content
+        is reused and chats that were already delivered to are skipped;
+        otherwise a fresh run is started in the journal. With a ``deadline``,
+        earlier content is sent when there is no time to generate, and sends
+        stop retrying once it has passed.
+
+        Raises:
+            RandomWordBotError: If content cannot be produced or any chat fails
+        """
+        for_date = for_date or datetime.date.today()
+        journal = self.journal(for_date)
+        if not resume:
+            journal.start()
+
+        if chat_ids is not None:
+            batches = iter([chat_ids])
+        else:
+            batches = self.subscribers.iter_batches(get_settings().subscribers_batch_size)
+
+        payloads: Dict[str, MessagePayload] = {}
+        generation_errors: Dict[str, Exception] = {}
+        report = DeliveryReport()
+        skipped = 0
+        for batch in batches:
+            owned = self.shard.filter(batch)
+            pending = journal.pending(owned)
+            skipped += len(owned) - len(pending)
+            if not pending:
+                continue
+
+            # Content is only resolved once some chat actually needs it, and
+            # once per variant however many chats share it
+            groups = self.preferences.group(pending)
+            missing = [
+                variant for variant in groups
+                if variant.key not in payloads and variant.key not in generation_errors
+            ]
+            built = await asyncio.gather(
+                *(self._build_payload(for_date, variant, journal, deadline) for variant in missing),
+                return_exceptions=True,
+            )
+            for variant, result in zip(missing, built):
+                if isinstance(result, BaseException):
+                    logger.error("Content variant failed", variant=variant.key, error=str(result))
+                    generation_errors[variant.key] = result
+                else:
+                    payloads[variant.key] = result
+
+            sendable = [
+                (variant, chats) for variant, chats in groups.items() if variant.key in payloads
+            ]
+            logger.info(
+                "Sending message to Telegram",
+                batch_size=len(pending),
+                variants=len(sendable),
+                shard=self.shard.name,
+            )
+            batch_reports = await asyncio.gather(*(
+                self.telegram_client.send_message(
+                    payloads[variant.key],
+                    chats,
+                    on_result=journal.record_delivery,
+                    deadline=deadline.stage(DELIVERY) if deadline is not None else None,
+                )
+                for variant, chats in sendable
+            ))
+            for batch_report in batch_reports:
+                report.results.extend(batch_report.results)
+
+        if skipped:
+            logger.info("Skipped chats already delivered to", skipped=skipped)
+        if generation_errors:
+            # Chats of the failed variants stay pending for --resume
+            error = next(iter(generation_errors.values()))
+            if isinstance(error, RandomWordBotError):
+                raise error
+            raise RandomWordBotError(str(error))
+        if not report.results:
+            logger.info("No pending chats to deliver to", date=for_date.isoformat(), shard=self.shard.name)
+            return
+        if report.failed:
+            raise TelegramBotError(
+                f"Failed to deliver to {len(report.failed)} of {len(report.results)} chats"
+            )
+
+    async def run(self, resume: bool = False) -> None:
+        """
+        Run the daily word generation and sending process.
+
+        Args:
+            resume: Continue today's journaled run instead of starting a new one
+        """
+        success = False
+        try:
+            deadline = Deadline.from_settings(get_settings())
+            logger.info(
+                "Starting Random Word Bot",
+                resume=resume,
+                deadline_seconds=round(deadline.remaining(), 3) if deadline is not None else None,
+            )
+            with metrics.span("run"):
+                # Connections are opened while the content is being generated
+                warming = (
+                    asyncio.create_task(self.warm_up())
+                    if get_settings().http_prewarm_seconds > 0
+                    else None
+                )
+                try:
+                    await self.deliver(resume=resume, deadline=deadline)
+                finally:
+                    if warming is not None:
+                        await warming
+            success = True
             logger.info("Random Word Bot completed successfully")
-            
+
         except RandomWordBotError as e:
             logger.error("Bot error occurred", error=str(e))
             sys.exit(1)
         except Exception as e:
             logger.error("Unexpected error", error=str(e))
             sys.exit(1)
+        finally:
+            self.export_metrics(success)
+
+    async def run_workers(self, workers: int, resume: bool = False) -> None:
+        """
+        Deliver today's content from ``workers`` processes, one shard each.
+
+        The content is generated (or taken from the cache) once here, before
+        any worker starts, so every shard sends the same message. Each worker
+        gets an equal share of the bot-wide Telegram rate limit.
+
+        Args:
+            workers: Number of worker processes
+            resume: Continue today's journaled run in every shard
+        """
+        success = False
+        for_date = datetime.date.today()
+        try:
+            deadline = Deadline.from_settings(get_settings())
+            logger.info("Starting sharded delivery", workers=workers, resume=resume)
+            with metrics.span("run"):
+                await self.ensure_content(for_date, self.preferences.variants(), deadline)
+                # Workers only deliver, so they get whatever time is left
+                remaining = deadline.remaining() if deadline is not None else None
+
+                loop = asyncio.get_running_loop()
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                    errors = await asyncio.gather(*(
+                        loop.run_in_executor(
+                            pool,
+                            deliver_shard,
+                            index,
+                            workers,
+                            for_date.isoformat(),
+                            resume,
+                            remaining,
+                        )
+                        for index in range(workers)
+                    ))
+
+            failed = [(index, error) for index, error in enumerate(errors) if error]
+            for index, error in failed:
+                logger.error("Shard delivery failed", shard=index, error=error)
+            if failed:
+                raise TelegramBotError(f"{len(failed)} of {workers} shards failed")
+            success = True
+            logger.info("Random Word Bot completed successfully", workers=workers)
+
+        except RandomWordBotError as e:
+            logger.error("Bot error occurred", error=str(e))
+            sys.exit(1)
+        except Exception as e:
+            logger.error("Unexpected error", error=str(e))
+            sys.exit(1)
+        finally:
+            self.export_metrics(success)
+
+    async def run_daemon(self) -> None:
+        """Keep clients warm and deliver at each configured slot until stopped."""
+        settings = get_settings()
+        scheduler = DeliveryScheduler(
+            parse_delivery_slots(settings),
+            self._deliver_slot,
+            warm_up=self.warm_up,
+            warm_up_seconds=settings.http_prewarm_seconds,
+        )
+        scheduler.install_signal_handlers()
+        server = None
+        if settings.metrics_port:
+            server = await metrics.serve(settings.metrics_host, settings.metrics_port)
+        try:
+            await scheduler.run_forever()
+        finally:
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+            await self.close()
+
+    async def _deliver_slot(self, chat_ids: Optional[List[int]], for_date: datetime.date) -> None:
+        success = False
+        try:
+            with metrics.span("run"):
+                # A restarted daemon must not re-send a slot it already delivered
+                await self.deliver(chat_ids, for_date, resume=True, deadline=self.slot_deadline())
+            success = True
+        finally:
+            self.export_metrics(success)
+
+    def slot_deadline(self) -> Optional[Deadline]:
+        """The deadline for a daemon slot firing now: RUN_DEADLINE_SECONDS from its send time."""
+        settings = get_settings()
+        if settings.run_deadline_seconds <= 0:
+            return None
+        return Deadline.within(
+            settings.run_deadline_seconds, parse_stage_budgets(settings.deadline_budgets_str)
+        )
+
+    def export_metrics(self, success: bool) -> None:
+        """Publish model health gauges and write the metrics textfile, if configured."""
+        usage_stats = self.ai_client.model_selector.get_usage_stats()
+        for model, health in usage_stats["model_health"].items():
+            metrics.set(
+                "model_success_rate",
+                health["success_rate"],
+                help="Smoothed model success rate",
+                model=model,
+            )
+            metrics.set(
+                "model_circuit_open",
+                int(health["circuit_open"]),
+                help="Whether the model's circuit breaker is open",
+                model=model,
+            )
+            if health["ewma_latency"] is not None:
+                metrics.set(
+                    "model_latency_ewma_seconds",
+                    health["ewma_latency"],
+                    help="EWMA of model completion latency",
+                    model=model,
+                )
+        metrics.set("last_run_timestamp_seconds", time.time(), help="When the last run finished")
+        metrics.set(
+            "last_run_success", int(success), help="Whether the last run delivered to every chat"
+        )
+        metrics.set("log_events", logging_stats.events, help="Log lines written by this process")
+        metrics.set(
+            "log_events_dropped", logging_stats.dropped, help="Log lines dropped by sampling or rate limits"
+        )
+        metrics.set(
+            "logging_overhead_seconds",
+            logging_stats.overhead_seconds,
+            help="Time the process spent producing log lines",
+        )
+        logger.info("Logging overhead", **logging_stats.summary())
+
+        path = get_settings().metrics_textfile_path
+        if path:
+            metrics.write_textfile(path)
+
+    async def warm_up(self) -> None:
+        """Open connections to the AI and Telegram APIs ahead of a delivery."""
+        from src.utils.http import warm_up
+
+        settings = get_settings()
+        await warm_up([settings.openrouter_base_url, settings.telegram_base_url])
+
+    async def close(self) -> None:
+        """Close the AI and Telegram clients and the shared connection pool."""
+        # Imported here so that importing main does not import httpx
+        from src.utils.http import close_http_transport
+
+        await self.ai_client.close()
+        await self.telegram_client.close()
+        await close_http_transport()
+        self.history.close()
+
+
+def setup_logging() -> None:
+    settings = get_settings()
+    configure_logging(
+        settings.log_level,
+        use_queue=settings.enable_log_queue,
+        sample_rates=parse_event_limits(settings.log_sample_rates_str),
+        rate_limits=parse_event_limits(settings.log_rate_limits_str),
+    )
+
+
+def deliver_shard(
+    index: int, count: int, for_date: str, resume: bool, deadline_seconds: Optional[float] = None
+) -> Optional[str]:
+    """
+    Worker process entry point for one delivery shard.
+
+    Args:
+        deadline_seconds: Time left in the run when the worker was started
+
+    Returns:
+        The error that stopped the shard, or None if every chat was delivered to
+    """
+    setup_logging()
+
+    async def run_shard() -> Optional[str]:
+        bot = RandomWordBot(ShardSpec(index, count))
+        try:
+            await bot.deliver(
+                for_date=datetime.date.fromisoformat(for_date),
+                resume=resume,
+                deadline=Deadline.within(deadline_seconds) if deadline_seconds is not None else None,
+            )
+            return None
+        except RandomWordBotError as e:
+            return str(e)
+        finally:
+            await bot.close()
+
+    return asyncio.run(run_shard())
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Send daily vocabulary words to Telegram")
+    parser.add_argument(
+        "--pregenerate",
+        type=int,
+        metavar="DAYS",
+        help="Generate and cache content for the next DAYS days instead of sending",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Stay resident and deliver at the times in DELIVERY_SCHEDULE",
+    )
+    parser.add_argument(
+        "--interactive",
+        action="store_true",
+        help="Stay resident and answer /today, /word and /more commands",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Finish today's interrupted run: reuse its content and send only to pending chats",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Deliver from this many worker processes, each sending to one shard of the chats",
+    )
+    parser.add_argument(
+        "--shard-index",
+        type=int,
+        default=0,
+        help="Shard of the chats this process delivers to, for sharding across hosts",
+    )
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=1,
+        help="Total number of shards the chats are split into",
+    )
+    parser.add_argument(
+        "--prompt-report",
+        action="store_true",
+        help="Log the recorded latency, token usage and pass rate of each prompt template and exit",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Log per-module import times and the time to the first network call",
+    )
+    return parser.parse_args()
 
 
 async def main():
     """Main entry point."""
+    args = parse_args()
+    settings = get_settings()
+
     # Configure logging
-    configure_logging(settings.log_level)
-    
+    setup_logging()
+
+    if args.prompt_report:
+        report = PromptStatsStore(settings.prompt_stats_path).report()
+        for row in report:
+            logger.info("Prompt template stats", **row)
+        if not report:
+            logger.info("No prompt stats recorded yet", path=settings.prompt_stats_path)
+        return
+
     # Validate configuration
     if not settings.telegram_bot_token:
         raise ConfigurationError("TELEGRAM_BOT_TOKEN is required")
-    
+
     if not settings.openrouter_api_key:
         raise ConfigurationError("OPENROUTER_API_KEY is required")
-    
-    if not settings.telegram_chat_ids:
+
+    needs_chat_ids = (
+        args.pregenerate is None
+        and not args.interactive
+        and not settings.subscribers_source.strip()
+        and not (args.daemon and settings.delivery_schedule_str.strip())
+    )
+    if needs_chat_ids and not settings.telegram_chat_ids:
         raise ConfigurationError("TELEGRAM_CHAT_IDS is required")
-    
+
     # Run the bot
-    bot = RandomWordBot()
-    await bot.run()
+    if args.workers > 1 and args.shard_count > 1:
+        raise ConfigurationError("--workers cannot be combined with --shard-count")
+
+    bot = RandomWordBot(ShardSpec(args.shard_index, args.shard_count))
+    try:
+        if args.pregenerate is not None:
+            await bot.pregenerate(args.pregenerate)
+        elif args.interactive:
+            await bot.run_interactive()
+        elif args.daemon:
+            await bot.run_daemon()
+        elif args.workers > 1:
+            await bot.run_workers(args.workers, resume=args.resume)
+        else:
+            await bot.run(resume=args.resume)
+    finally:
+        if startup_profiler is not None:
+            logger.info("Startup profile", **startup_profiler.report())
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+import json
+import re
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from ..utils.exceptions import InvalidResponseError
+from .variants import ContentVariant
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+class VocabularyWord(BaseModel):
+    """One vocabulary word with its definition."""
+
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    word: str = Field(min_length=1)
+    part_of_speech: str = Field(min_length=1)
+    definition: str = Field(min_length=1)
+    example: Optional[str] = None
+
+    def to_markdown(self) -> str:
+        entry = f"**{self.word}** ({self.part_of_speech}): {self.definition}"
+        if self.example:
+            entry += f"\n   _Example:_ {self.example}"
+        return entry
+
+
+class LanguageWord(BaseModel):
+    """The second-language word of the day."""
+
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    language: str = Field(min_length=1)
+    word: str = Field(min_length=1)
+    pronunciation: str = Field(min_length=1)
+    part_of_speech: str = Field(min_length=1)
+    meaning: str = Field(min_length=1)
+
+
+class DailyContent(BaseModel):
+    """
+    Typed daily content, as produced in structured output mode.
+
+    Cached and journaled as compact JSON, so it can be re-rendered for any
+    format or chat without another model call.
+    """
+
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    theme: str = Field(min_length=1)
+    words: List[VocabularyWord] = Field(min_length=1)
+    language_word: Optional[LanguageWord] = None
+
+    def vocabulary(self) -> List[str]:
+        return [word.word.lower() for word in self.words]
+
+    def to_json(self) -> str:
+        return self.model_dump_json(exclude_none=True)
+
+    def to_markdown(self) -> str:
+        """Render the content as the markdown the message formatter expects."""
+        sections = [f"**Today's theme**\n\n{self.theme}", "## Words of the day"]
+        for number, word in enumerate(self.words, start=1):
+            sections.append(f"{number}. {word.to_markdown()}")
+
+        if self.language_word is not None:
+            extra = self.language_word
+            sections.append(f"## {extra.language} word of the day")
+            sections.append(
+                f"**{extra.word}** ({extra.pronunciation}), {extra.part_of_speech}: {extra.meaning}"
+            )
+        return "\n\n".join(sections)
+
+
+def json_schema_prompt(variant: ContentVariant) -> str:
+    """Describe the JSON object the model must answer with."""
+    example = {
+        "theme": "A few paragraphs analysing today's date and theme",
+        "words": [
+            {
+                "word": "word",
+                "part_of_speech": "noun",
+                "definition": "Clear definition",
+                "example": "Example sentence, or null",
+            }
+        ],
+    }
+    if variant.language:
+        example["language_word"] = {
+            "language": variant.language,
+            "word": f"The word in {variant.language} script",
+            "pronunciation": "Pronunciation in English",
+            "part_of_speech": "noun",
+            "meaning": "Meaning in English",
+        }
+    return (
+        "Respond with a single JSON object and nothing else: no markdown, no code fences, "
+        f"no signature. \"words\" must hold exactly {variant.num_words} entries. "
+        f"Use this shape:\n{json.dumps(example, indent=2, ensure_ascii=False)}"
+    )
+
+
+def parse_model_output(text: str, variant: ContentVariant) -> DailyContent:
+    """
+    Validate a structured-mode model response.
+
+    Raises:
+        InvalidResponseError: If the response is not valid content for ``variant``
+    """
+    payload = _CODE_FENCE.sub("", text.strip())
+    start, end = payload.find("{"), payload.rfind("}")
+    if start < 0 or end < start:
+        raise InvalidResponseError("Response does not contain a JSON object")
+
+    try:
+        content = DailyContent.model_validate_json(payload[start:end + 1])
+    except ValidationError as e:
+        raise InvalidResponseError(
+            f"Response does not match the content schema: {e.error_count()} errors, "
+            f"first: {e.errors()[0]['loc']} {e.errors()[0]['msg']}"
+        )
+
+    if len(content.words) < variant.num_words:
+        raise InvalidResponseError(
+            f"Expected {variant.num_words} words, got {len(content.words)}"
+        )
+    if variant.language and content.language_word is None:
+        raise InvalidResponseError(f"Missing the {variant.language} word of the day")
+
+    content.words = content.words[:variant.num_words]
+    if not variant.language:
+        content.language_word = None
+    return content
+
+
+def load_content(text: str) -> Optional[DailyContent]:
+    """Return the typed content stored in ``text``, or None for free-text content."""
+    if not text.lstrip().startswith("{"):
+        return None
+    try:
+        return DailyContent.model_validate_json(text)
+    except ValidationError:
+        return None
@@ -1,11 +1,21 @@
+import math
 import random
+import time
 from typing import List, Optional, Set
-import structlog
 
 from ..config.settings import Settings
+from ..utils.exceptions import EmptyResponseError
+from ..utils.logging import get_logger
+from .model_stats import ModelStatsStore
 
 
-logger = structlog.get_logger(__name__)
+logger = get_logger(__name__)
+
+MIN_LATENCY_SAMPLES = 5
+# Latency assumed for models that have never answered successfully
+DEFAULT_LATENCY_SECONDS = 10.0
+# Smallest selection weight, so that every eligible model stays selectable
+MIN_SCORE = 1e-6
 
 
 class ModelSelector:
@@ -14,18 +24,19 @@ class ModelSelector:
         self.available_models = settings.available_models.copy()
         self.failed_models: Set[str] = set()
         self.model_usage_count: dict[str, int] = {}
-        
+        self.stats = ModelStatsStore(settings.model_stats_path)
+
     def get_random_model(self, exclude_models: Optional[List[str]] = None) -> str:
         exclude_models = exclude_models or []
-        
+
         if not self.settings.enable_model_rotation:
             return self.available_models[0]
-            
+
         eligible_models = [
             model for model in self.available_models
             if model not in exclude_models and model not in self.failed_models
         ]
-        
+
         if not eligible_models:
             logger.warning(
                 "No eligible models available, clearing failed models and retrying",
@@ -37,7 +48,7 @@ class ModelSelector:
                 model for model in self.available_models
                 if model not in exclude_models
             ]
-            
+
         if not eligible_models:
             logger.error(
                 "No models available after clearing failures",
@@ -45,28 +56,104 @@ class ModelSelector:
                 exclude_models=exclude_models
             )
             raise RuntimeError("No available models to use")
-            
-        selected_model = random.choice(eligible_models)
+
+        now = time.time()
+        closed_models = [
+            model for model in eligible_models
+            if not self.stats.get(model).is_circuit_open(now)
+        ]
+        if closed_models:
+            eligible_models = closed_models
+        else:
+            logger.warning(
+                "All eligible models have open circuits, ignoring cool-down",
+                eligible_models=eligible_models
+            )
+
+        if random.random() < self.settings.model_exploration_rate:
+            selected_model = random.choice(eligible_models)
+        else:
+            selected_model = random.choices(
+                eligible_models,
+                weights=[self._score(model) for model in eligible_models],
+            )[0]
         self.model_usage_count[selected_model] = self.model_usage_count.get(selected_model, 0) + 1
-        
-        logger.info(
+
+        logger.debug(
             "Selected random model",
             model=selected_model,
             total_usage=self.model_usage_count[selected_model],
             eligible_count=len(eligible_models)
         )
-        
+
         return selected_model
-    
+
+    def _score(self, model: str) -> float:
+        """Weight a model by its success rate per second of expected latency."""
+        stats = self.stats.get(model)
+        latency = stats.ewma_latency if stats.ewma_latency is not None else DEFAULT_LATENCY_SECONDS
+        score = stats.success_rate * (1 - stats.empty_response_rate) / max(latency, 0.1)
+        # random.choices rejects weights that are all zero
+        return max(score, MIN_SCORE)
+
     def mark_model_failed(self, model: str, error: Exception):
         self.failed_models.add(model)
+        stats = self.stats.get(model)
+        stats.record_failure(
+            empty_response=isinstance(error, EmptyResponseError),
+            failure_threshold=self.settings.model_circuit_failure_threshold,
+            cooldown_seconds=self.settings.model_circuit_cooldown_seconds,
+        )
+        self.stats.save()
         logger.warning(
             "Marked model as failed",
             model=model,
             error=str(error),
-            total_failed=len(self.failed_models)
+            total_failed=len(self.failed_models),
+            consecutive_failures=stats.consecutive_failures,
+            circuit_open=stats.is_circuit_open()
+        )
+
+    def record_success(
+        self,
+        model: str,
+        latency_seconds: float,
+        ttft_seconds: Optional[float] = None,
+        tokens_per_second: Optional[float] = None,
+    ):
+        stats = self.stats.get(model)
+        stats.record_success(
+            latency_seconds,
+            self.settings.model_latency_ewma_alpha,
+            ttft_seconds,
+            tokens_per_second,
         )
-    
+        self.stats.save()
+        logger.debug(
+            "Recorded model latency",
+            model=model,
+            latency_seconds=round(latency_seconds, 3),
+            ewma_latency=round(stats.ewma_latency, 3)
+        )
+
+    def get_latency_percentile(
+        self, percentile: float, model: Optional[str] = None
+    ) -> Optional[float]:
+        if model is not None and len(self.stats.get(model).latency_samples) >= MIN_LATENCY_SAMPLES:
+            samples = self.stats.get(model).latency_samples
+        else:
+            samples = [
+                sample
+                for name in self.available_models
+                for sample in self.stats.get(name).latency_samples
+            ]
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+
+        ordered = sorted(samples)
+        rank = min(len(ordered) - 1, max(0, math.ceil(percentile * len(ordered)) - 1))
+        return ordered[rank]
+
     def get_model_for_retry(self, used_models: List[str]) -> Optional[str]:
         if len(used_models) >= self.settings.max_retry_attempts:
             logger.warning(
@@ -75,7 +162,7 @@ class ModelSelector:
                 used_models=used_models
             )
             return None
-            
+
         try:
             return self.get_random_model(exclude_models=used_models)
         except RuntimeError:
@@ -85,18 +172,28 @@ class ModelSelector:
                 failed_models=list(self.failed_models)
             )
             return None
-    
+
     def get_usage_stats(self) -> dict:
         return {
             "model_usage_count": self.model_usage_count.copy(),
             "failed_models": list(self.failed_models),
             "total_models": len(self.available_models),
             "available_models": len([
-                m for m in self.available_models 
+                m for m in self.available_models
                 if m not in self.failed_models
-            ])
+            ]),
+            "model_health": {
+                model: {
+                    "success_rate": round(self.stats.get(model).success_rate, 3),
+                    "ewma_latency": self.stats.get(model).ewma_latency,
+                    "ewma_ttft": self.stats.get(model).ewma_ttft,
+                    "ewma_tokens_per_second": self.stats.get(model).ewma_tokens_per_second,
+                    "circuit_open": self.stats.get(model).is_circuit_open(),
+                }
+                for model in self.available_models
+            },
         }
-    
+
     def reset_failed_models(self):
         self.failed_models.clear()
-        logger.info("Reset all failed models")
\ No newline at end of file
+        logger.info("Reset all failed models")
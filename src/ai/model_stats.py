@@ -0,0 +1,83 @@
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from ..utils.stats_store import StatsStore
+
+# Number of recent successful latencies kept per model for percentile estimates
+LATENCY_WINDOW = 50
+
+
+def _ewma(current: Optional[float], sample: float, alpha: float) -> float:
+    if current is None:
+        return sample
+    return alpha * sample + (1 - alpha) * current
+
+
+@dataclass
+class ModelStats:
+    """Health and latency statistics for a single model."""
+
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    empty_responses: int = 0
+    consecutive_failures: int = 0
+    ewma_latency: Optional[float] = None
+    ewma_ttft: Optional[float] = None
+    ewma_tokens_per_second: Optional[float] = None
+    latency_samples: List[float] = field(default_factory=list)
+    circuit_open_until: float = 0.0
+    last_used_at: float = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace smoothing keeps new models from scoring zero or one
+        return (self.successes + 1) / (self.requests + 2)
+
+    @property
+    def empty_response_rate(self) -> float:
+        return self.empty_responses / self.requests if self.requests else 0.0
+
+    def is_circuit_open(self, now: Optional[float] = None) -> bool:
+        return self.circuit_open_until > (now if now is not None else time.time())
+
+    def record_success(
+        self,
+        latency_seconds: float,
+        alpha: float,
+        ttft_seconds: Optional[float] = None,
+        tokens_per_second: Optional[float] = None,
+    ) -> None:
+        self.requests += 1
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.circuit_open_until = 0.0
+        self.last_used_at = time.time()
+        self.ewma_latency = _ewma(self.ewma_latency, latency_seconds, alpha)
+        if ttft_seconds is not None:
+            self.ewma_ttft = _ewma(self.ewma_ttft, ttft_seconds, alpha)
+        if tokens_per_second is not None:
+            self.ewma_tokens_per_second = _ewma(
+                self.ewma_tokens_per_second, tokens_per_second, alpha
+            )
+        self.latency_samples = (self.latency_samples + [latency_seconds])[-LATENCY_WINDOW:]
+
+    def record_failure(
+        self, empty_response: bool, failure_threshold: int, cooldown_seconds: float
+    ) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_used_at = time.time()
+        if empty_response:
+            self.empty_responses += 1
+        if self.consecutive_failures >= failure_threshold:
+            self.circuit_open_until = self.last_used_at + cooldown_seconds
+
+
+class ModelStatsStore(StatsStore[ModelStats]):
+    """Per-model statistics persisted to a small JSON file between runs."""
+
+    record_class = ModelStats
+    section = "models"
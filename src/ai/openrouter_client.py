@@ -1,12 +1,26 @@
+import asyncio
 import json
 import datetime
-from typing import Dict, Any, List
-from openai import OpenAI
+import time
+from typing import Callable, Dict, Any, List, Optional
 
-from ..config.settings import settings
-from ..utils.exceptions import AIServiceError
+from ..config.settings import get_settings
+from ..utils.deadline import Deadline
+from ..utils.exceptions import (
+    AIServiceError,
+    DeadlineExceededError,
+    EmptyResponseError,
+    InvalidResponseError,
+    TruncatedResponseError,
+    StreamTimeoutError,
+)
 from ..utils.logging import get_logger
+from ..utils.metrics import metrics
+from .content import parse_model_output
 from .model_selector import ModelSelector
+from .prompt_stats import PromptStatsStore
+from .prompts import RenderedPrompt, choose_template, get_template, parse_prompt_experiment
+from .variants import ContentVariant
 
 logger = get_logger(__name__)
 
@@ -15,127 +29,451 @@ class OpenRouterClient:
     """Client for interacting with OpenRouter AI service."""
 
     def __init__(self):
-        self.client = OpenAI(
-            api_key=settings.openrouter_api_key, base_url="https://openrouter.ai/api/v1"
+        # Imported here: the openai package is slow to import and only needed
+        # once a client is actually constructed
+        from openai import AsyncOpenAI
+
+        from ..utils.http import openai_http_client
+
+        self.settings = get_settings()
+        self.client = AsyncOpenAI(
+            api_key=self.settings.openrouter_api_key,
+            base_url=self.settings.openrouter_base_url,
+            timeout=self.settings.ai_request_timeout_seconds,
+            max_retries=0,
+            http_client=openai_http_client(),
+        )
+        self.model_selector = ModelSelector(self.settings)
+        get_template(self.settings.prompt_template)
+        self.prompt_experiment = parse_prompt_experiment(self.settings.prompt_experiment_str)
+        self.prompt_stats = PromptStatsStore(self.settings.prompt_stats_path)
+
+    async def close(self) -> None:
+        """Close the client; the shared connection pool stays open."""
+        await self.client.close()
+
+    def _create_prompt(
+        self,
+        today: str,
+        random_words: List[str],
+        avoid_words: Optional[List[str]] = None,
+        variant: Optional[ContentVariant] = None,
+    ) -> RenderedPrompt:
+        """Create the prompt for the AI model from the configured (or experimental) template."""
+        template = choose_template(self.settings.prompt_template, self.prompt_experiment)
+        return template.render(
+            today,
+            random_words,
+            variant or ContentVariant.from_settings(self.settings),
+            structured=self.settings.enable_structured_output,
+            avoid_words=avoid_words,
         )
-        self.model_selector = ModelSelector(settings)
-
-    def _create_prompt(self, today: str, random_words: List[str]) -> str:
-        """Create the prompt for the AI model."""
-        return f"""
-        datetime.now().isoformat() = {today}
-        overall theme = {random_words}
-
-        You are a helpful "day start thoughts" assistant.
-        Provide 5 good words for us today that will help build our vocabulary.
-        Tell words that are not super common, but could be uncommon for non-native
-        english speakers. The overall theme contains some randomly picked words 
-        the Operating System's words directory. You may use that as inspiration
-        to come up with the 5 words. Find literary words, words that you might
-        read in a novel, or sometimes find technical words. Stay close to the
-        theme and think about the psychological profile and stuff. you got this.
-        Let the date of the day affect your word selection choice a lot as well
-        so that there is uniqueness every single day.
-
-        First, write about today's theme - analyze the date and find out what is significant about today's date.
-        Analyze today from these perspectives and include the overall theme in some way:
-        - Significance of the numbers (from a numerology perspective)
-        - Significance of today's date (i.e. any important events in the past on the same day?)
-        - Significance about any past recent or future recent event/festivities around this
-        - The psychological make up of people around this date
-
-        After the theme analysis, provide 5 vocabulary words that relate to the day's themes.
-        For each word, provide:
-        - The word itself (in bold)
-        - Part of speech
-        - Clear definition
-        - Example sentence (if appropriate)
-
-        Finally, provide a Tamil word of the day. Since the user barely knows any Tamil, 
-        give common words related to the English words or today's theme. For the Tamil word, provide:
-        - The word in Tamil script
-        - Pronunciation in English
-        - Part of speech
-        - Meaning in English
-
-        Format your response naturally with clear sections. Use markdown formatting like **bold** for emphasis.
-        Don't mention the "overall theme" directly, but you may mention its synonyms if you want.
-
-        The response should flow naturally and be well-organized with clear headings for each section.
-
-        End your response with "By Light (@justanotherlight)" as the signature.
+
+    def _completion_options(self) -> Dict[str, Any]:
+        """Extra completion arguments, such as the output token cap."""
+        max_tokens = (
+            self.settings.ai_structured_max_tokens
+            if self.settings.enable_structured_output
+            else self.settings.ai_max_tokens
+        )
+        return {"max_tokens": max_tokens} if max_tokens > 0 else {}
+
+    def _check_finished(self, model: str, prompt: RenderedPrompt, finish_reason: Optional[str]) -> None:
+        """
+        Fail the attempt when the model stopped at the token cap, so that a
+        cut-off message is never sent and the next model is tried.
+
+        Raises:
+            TruncatedResponseError: If the response was cut off by the token cap
         """
+        if finish_reason != "length":
+            return
+        metrics.inc("ai_truncated_responses", help="AI responses cut off by the token cap", model=model)
+        logger.warning("AI response hit the output token cap", model=model, prompt=prompt.template)
+        raise TruncatedResponseError(f"Response from {model} was cut off by the output token cap")
 
-    async def generate_daily_words(self, random_words: List[str]) -> str:
+    def _record_usage(
+        self,
+        model: str,
+        prompt: RenderedPrompt,
+        latency: float,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+    ) -> None:
+        if prompt_tokens is not None:
+            metrics.inc(
+                "ai_prompt_tokens", prompt_tokens, help="Prompt tokens used", model=model, prompt=prompt.template
+            )
+        if completion_tokens is not None:
+            metrics.inc(
+                "ai_completion_tokens",
+                completion_tokens,
+                help="Completion tokens used",
+                model=model,
+                prompt=prompt.template,
+            )
+        self.prompt_stats.record_success(
+            prompt.stats_key, len(prompt.text), latency, prompt_tokens, completion_tokens
+        )
+
+    async def generate_daily_words(
+        self,
+        random_words: List[str],
+        for_date: Optional[datetime.date] = None,
+        avoid_words: Optional[List[str]] = None,
+        variant: Optional[ContentVariant] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> str:
         """
         Generate daily words with definitions using OpenRouter AI.
 
         Args:
             random_words: List of random words for theme inspiration
+            for_date: Date the content is for, defaults to now
+            avoid_words: Recently used vocabulary words the model should not repeat
+            variant: Language, word count and difficulty, defaults to the settings
+            deadline: When to give up, including any retries and hedges
 
         Returns:
-            Formatted text response containing today's theme, words, and Tamil word
+            Formatted text response containing today's theme, words, and second-language
+            word, or the validated content as compact JSON in structured output mode
 
         Raises:
             AIServiceError: If AI service fails
+            DeadlineExceededError: If ``deadline`` passes before a model answers
         """
-        today = datetime.datetime.now().isoformat()
-        prompt = self._create_prompt(today, random_words)
+        today = for_date.isoformat() if for_date else datetime.datetime.now().isoformat()
+        variant = variant or ContentVariant.from_settings(self.settings)
+        prompt = self._create_prompt(today, random_words, avoid_words, variant)
         used_models = []
-        
-        while len(used_models) < settings.max_retry_attempts:
-            model = None
-            try:
-                model = self.model_selector.get_random_model(exclude_models=used_models)
-                used_models.append(model)
 
-                logger.info(
-                    "Generating daily words",
-                    model=model,
-                    words_count=len(random_words),
-                    attempt=len(used_models),
-                )
+        parse = None
+        if self.settings.enable_structured_output:
+            # Invalid output fails the attempt, so the next model is tried
+            def parse(text: str) -> str:
+                return parse_model_output(text, variant).to_json()
 
-                response = self.client.chat.completions.create(
-                    model=model,
-                    messages=[{"role": "user", "content": prompt}],
+        timeout = deadline.remaining if deadline is not None else lambda: None
+        if self.settings.enable_hedged_requests:
+            try:
+                # Cancelling the hedged search cancels every request in flight
+                response_text = await asyncio.wait_for(
+                    self._generate_hedged(prompt, used_models, parse), timeout()
                 )
+            except asyncio.TimeoutError:
+                raise self._deadline_exceeded(used_models)
+            if response_text is not None:
+                return response_text
+        else:
+            while len(used_models) < self.settings.max_retry_attempts:
+                if deadline is not None and deadline.expired():
+                    raise self._deadline_exceeded(used_models)
+                model = None
+                try:
+                    model = self.model_selector.get_random_model(exclude_models=used_models)
+                    used_models.append(model)
+                    if len(used_models) > 1:
+                        metrics.inc("ai_retries", help="AI attempts after the first model")
 
-                response_text = response.choices[0].message.content
-                if response_text is None:
-                    raise ValueError("Received empty response from AI")
-                    
-                logger.info("Received AI response", response_length=len(response_text))
+                    logger.info(
+                        "Generating daily words",
+                        model=model,
+                        words_count=len(random_words),
+                        attempt=len(used_models),
+                        prompt=prompt.template,
+                    )
 
-                # Return the raw text response
-                logger.info(
-                    "Successfully received AI response",
-                    model=model,
-                    usage_stats=self.model_selector.get_usage_stats()
-                )
-                return response_text
+                    return await asyncio.wait_for(
+                        self._request_completion(model, prompt, parse), timeout()
+                    )
 
-            except Exception as e:
-                logger.error(
-                    "AI service error with model",
-                    error=str(e),
-                    model=model or 'unknown',
-                    attempt=len(used_models),
-                )
-                if model:
-                    self.model_selector.mark_model_failed(model, e)
-                
-                # Try next model if available
-                next_model = self.model_selector.get_model_for_retry(used_models)
-                if next_model is None:
-                    break
-                continue
+                except asyncio.TimeoutError:
+                    # Out of time rather than a model failure
+                    raise self._deadline_exceeded(used_models)
+                except Exception as e:
+                    self._handle_model_error(model, e, len(used_models))
+
+                    # Try next model if available
+                    next_model = self.model_selector.get_model_for_retry(used_models)
+                    if next_model is None:
+                        break
+                    continue
 
         # All models failed
         logger.error(
             "All models failed to generate daily words",
             used_models=used_models,
             failed_models=list(self.model_selector.failed_models),
-            max_attempts=settings.max_retry_attempts,
+            max_attempts=self.settings.max_retry_attempts,
         )
         raise AIServiceError("All available models failed to generate daily words")
+
+    async def _request_completion(
+        self, model: str, prompt: RenderedPrompt, parse: Optional[Callable[[str], str]] = None
+    ) -> str:
+        """
+        Run a single completion request against ``model``.
+
+        Args:
+            parse: Validates and normalises the response text; raising from it
+                fails the attempt before it is counted as a success
+        """
+        with metrics.span("model_attempt", model=model):
+            try:
+                if self.settings.enable_streaming:
+                    return await self._stream_completion(model, prompt, parse)
+                return await self._complete(model, prompt, parse)
+            except (EmptyResponseError, InvalidResponseError) as e:
+                # Other failures say nothing about the prompt
+                self.prompt_stats.record_rejected(
+                    prompt.stats_key, len(prompt.text), truncated=isinstance(e, TruncatedResponseError)
+                )
+                raise
+
+    async def _complete(
+        self, model: str, prompt: RenderedPrompt, parse: Optional[Callable[[str], str]] = None
+    ) -> str:
+        """Run a single non-streaming completion request against ``model``."""
+        started_at = time.monotonic()
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt.text}],
+            **self._completion_options(),
+        )
+
+        response_text = response.choices[0].message.content
+        if response_text is None:
+            raise EmptyResponseError("Received empty response from AI")
+        self._check_finished(model, prompt, response.choices[0].finish_reason)
+        if parse is not None:
+            response_text = parse(response_text)
+
+        latency = time.monotonic() - started_at
+        self.model_selector.record_success(model, latency)
+        usage = response.usage
+        self._record_usage(
+            model,
+            prompt,
+            latency,
+            usage.prompt_tokens if usage is not None else None,
+            usage.completion_tokens if usage is not None else None,
+        )
+        logger.info("Received AI response", response_length=len(response_text))
+
+        # Return the raw text response
+        logger.info(
+            "Successfully received AI response",
+            model=model,
+            latency_seconds=round(latency, 3),
+        )
+        logger.debug("Model usage", usage_stats=self.model_selector.get_usage_stats())
+        return response_text
+
+    async def _stream_completion(
+        self, model: str, prompt: RenderedPrompt, parse: Optional[Callable[[str], str]] = None
+    ) -> str:
+        """
+        Stream a completion from ``model``, aborting early when the first token
+        takes too long or the stream stalls between chunks.
+
+        Raises:
+            StreamTimeoutError: If the first-token or stall timeout is exceeded
+            EmptyResponseError: If the stream finished without any content
+            TruncatedResponseError: If the response was cut off by the token cap
+            InvalidResponseError: If ``parse`` rejects the streamed response
+        """
+        started_at = time.monotonic()
+        first_token_deadline = started_at + self.settings.stream_first_token_timeout_seconds
+        try:
+            stream = await asyncio.wait_for(
+                self.client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt.text}],
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **self._completion_options(),
+                ),
+                timeout=self.settings.stream_first_token_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            raise StreamTimeoutError(
+                f"No response from {model} within "
+                f"{self.settings.stream_first_token_timeout_seconds}s"
+            )
+
+        parts: List[str] = []
+        first_token_at = None
+        prompt_tokens = None
+        completion_tokens = None
+        finish_reason = None
+        chunk_count = 0
+        chunks = stream.__aiter__()
+        try:
+            while True:
+                if first_token_at is None:
+                    timeout = max(0.0, first_token_deadline - time.monotonic())
+                else:
+                    timeout = self.settings.stream_stall_timeout_seconds
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    if first_token_at is None:
+                        raise StreamTimeoutError(
+                            f"No first token from {model} within "
+                            f"{self.settings.stream_first_token_timeout_seconds}s"
+                        )
+                    raise StreamTimeoutError(
+                        f"Stream from {model} stalled for "
+                        f"{self.settings.stream_stall_timeout_seconds}s"
+                    )
+
+                if chunk.usage is not None:
+                    prompt_tokens = chunk.usage.prompt_tokens
+                    completion_tokens = chunk.usage.completion_tokens
+                if chunk.choices and chunk.choices[0].finish_reason:
+                    finish_reason = chunk.choices[0].finish_reason
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.monotonic()
+                chunk_count += 1
+                parts.append(chunk.choices[0].delta.content)
+        finally:
+            await stream.close()
+
+        if first_token_at is None:
+            raise EmptyResponseError("Received empty response from AI")
+
+        self._check_finished(model, prompt, finish_reason)
+        response_text = "".join(parts)
+        if parse is not None:
+            response_text = parse(response_text)
+
+        finished_at = time.monotonic()
+        latency = finished_at - started_at
+        ttft = first_token_at - started_at
+        # Fall back to counting chunks when the provider does not report usage
+        tokens = completion_tokens if completion_tokens is not None else chunk_count
+        generation_time = finished_at - first_token_at
+        tokens_per_second = tokens / generation_time if generation_time > 0 else None
+
+        self.model_selector.record_success(model, latency, ttft, tokens_per_second)
+        self._record_usage(model, prompt, latency, prompt_tokens, completion_tokens)
+        logger.info(
+            "Successfully streamed AI response",
+            model=model,
+            response_length=len(response_text),
+            latency_seconds=round(latency, 3),
+            ttft_seconds=round(ttft, 3),
+            tokens_per_second=round(tokens_per_second, 1) if tokens_per_second else None,
+        )
+        return response_text
+
+    def _deadline_exceeded(self, used_models: List[str]) -> DeadlineExceededError:
+        metrics.inc("ai_deadline_exceeded", help="AI generations stopped by the run deadline")
+        logger.warning("AI generation ran out of time", used_models=used_models)
+        return DeadlineExceededError(
+            f"AI generation ran out of time after {len(used_models)} attempts"
+        )
+
+    def _handle_model_error(self, model: Optional[str], error: Exception, attempt: int) -> None:
+        metrics.inc(
+            "ai_failures",
+            help="Failed AI completion attempts",
+            model=model or "unknown",
+            reason=type(error).__name__,
+        )
+        logger.error(
+            "AI service error with model",
+            error=str(error),
+            model=model or 'unknown',
+            attempt=attempt,
+        )
+        if model:
+            self.model_selector.mark_model_failed(model, error)
+
+    def _hedge_delay(self, model: str) -> float:
+        observed = self.model_selector.get_latency_percentile(
+            self.settings.hedge_latency_percentile, model
+        )
+        if observed is None:
+            return self.settings.hedge_default_delay_seconds
+        return observed
+
+    async def _generate_hedged(
+        self,
+        prompt: RenderedPrompt,
+        used_models: List[str],
+        parse: Optional[Callable[[str], str]] = None,
+    ) -> Optional[str]:
+        """
+        Query models with hedging: when the running request is slower than the
+        configured latency percentile, start another model in parallel and
+        keep whichever valid answer arrives first.
+
+        The next hedge is due once the most recently started request has run
+        for its model's hedge delay, counted from when that request started.
+        """
+        pending: Dict[asyncio.Task, str] = {}
+        # When each in-flight request is due a hedge, in start order
+        hedge_at: Dict[asyncio.Task, float] = {}
+
+        def launch() -> bool:
+            model = self.model_selector.get_model_for_retry(used_models)
+            if model is None:
+                return False
+            used_models.append(model)
+            if pending:
+                metrics.inc("ai_hedged_requests", help="AI requests started as hedges")
+            elif len(used_models) > 1:
+                metrics.inc("ai_retries", help="AI attempts after the first model")
+            logger.info(
+                "Generating daily words",
+                model=model,
+                attempt=len(used_models),
+                hedged=bool(pending),
+            )
+            task = asyncio.create_task(self._request_completion(model, prompt, parse))
+            pending[task] = model
+            hedge_at[task] = time.monotonic() + self._hedge_delay(model)
+            return True
+
+        launch()
+        models_left = True
+        try:
+            while pending:
+                timeout = None
+                if models_left and len(pending) < self.settings.hedge_max_parallel_requests:
+                    newest = next(reversed(hedge_at))
+                    timeout = max(0.0, hedge_at[newest] - time.monotonic())
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    in_flight = list(pending.values())
+                    # Without a model left, wait for the requests in flight
+                    models_left = launch()
+                    if models_left:
+                        logger.info("Starting hedged request", in_flight=in_flight)
+                    continue
+
+                for task in done:
+                    model = pending.pop(task)
+                    del hedge_at[task]
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    self._handle_model_error(model, error, len(used_models))
+
+                if not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return None
@@ -0,0 +1,85 @@
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..utils.stats_store import StatsStore
+
+
+@dataclass
+class PromptStats:
+    """Outcomes of the requests made with one prompt template."""
+
+    requests: int = 0
+    valid: int = 0
+    rejected: int = 0
+    latency_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Requests whose response reported token usage
+    usage_reported: int = 0
+    prompt_chars: int = 0
+    truncated: int = 0
+    last_used_at: float = 0.0
+
+    @property
+    def pass_rate(self) -> Optional[float]:
+        """Share of answered requests whose response was usable."""
+        answered = self.valid + self.rejected
+        return self.valid / answered if answered else None
+
+    def summary(self) -> dict:
+        def mean(total: float, count: int) -> Optional[float]:
+            return round(total / count, 3) if count else None
+
+        return {
+            "requests": self.requests,
+            "pass_rate": round(self.pass_rate, 3) if self.pass_rate is not None else None,
+            "mean_latency_seconds": mean(self.latency_seconds, self.valid),
+            "mean_prompt_tokens": mean(self.prompt_tokens, self.usage_reported),
+            "mean_completion_tokens": mean(self.completion_tokens, self.usage_reported),
+            "mean_prompt_chars": mean(self.prompt_chars, self.requests),
+            "truncated": self.truncated,
+        }
+
+
+class PromptStatsStore(StatsStore[PromptStats]):
+    """Per-template prompt statistics persisted to a small JSON file between runs."""
+
+    record_class = PromptStats
+    section = "prompts"
+
+    def record_success(
+        self,
+        key: str,
+        prompt_chars: int,
+        latency_seconds: float,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+    ) -> None:
+        stats = self._record_request(key, prompt_chars)
+        stats.valid += 1
+        stats.latency_seconds += latency_seconds
+        if prompt_tokens is not None and completion_tokens is not None:
+            stats.usage_reported += 1
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+        self.save()
+
+    def record_rejected(self, key: str, prompt_chars: int, truncated: bool = False) -> None:
+        """Record a response that was empty, cut off by the token cap or failed validation."""
+        stats = self._record_request(key, prompt_chars)
+        stats.rejected += 1
+        if truncated:
+            stats.truncated += 1
+        self.save()
+
+    def _record_request(self, key: str, prompt_chars: int) -> PromptStats:
+        stats = self.get(key)
+        stats.requests += 1
+        stats.prompt_chars += prompt_chars
+        stats.last_used_at = time.time()
+        return stats
+
+    def report(self) -> List[dict]:
+        """One summary per template, in name order."""
+        return [{"prompt": key, **self.stats[key].summary()} for key in sorted(self.stats)]
@@ -0,0 +1,193 @@
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from ..utils.exceptions import ConfigurationError
+from .content import json_schema_prompt
+from .variants import ContentVariant
+
+
+def normalize_prompt(text: str) -> str:
+    """Strip indentation and repeated whitespace, keeping single blank lines between paragraphs."""
+    lines: List[str] = []
+    for line in text.strip().splitlines():
+        line = " ".join(line.split())
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    """A prompt ready to send, tagged with the template it came from."""
+
+    template: str
+    text: str
+    structured: bool = False
+
+    @property
+    def stats_key(self) -> str:
+        """Templates are compared separately for free-text and JSON output."""
+        return f"{self.template}:{'json' if self.structured else 'text'}"
+
+
+class PromptTemplate:
+    """
+    A prompt with its optional sections, normalised once when it is defined.
+
+    Rendering only fills in placeholders; no whitespace handling or string
+    building happens per call beyond joining the sections that apply.
+    """
+
+    def __init__(self, name: str, body: str, second_language: str, free_text_format: str):
+        self.name = name
+        self.body = normalize_prompt(body)
+        self.second_language = normalize_prompt(second_language)
+        self.free_text_format = normalize_prompt(free_text_format)
+
+    def render(
+        self,
+        today: str,
+        random_words: List[str],
+        variant: ContentVariant,
+        structured: bool = False,
+        avoid_words: Optional[List[str]] = None,
+    ) -> RenderedPrompt:
+        sections = [self.body.format(today=today, theme=random_words, num_words=variant.num_words)]
+        if variant.language:
+            sections.append(self.second_language.format(language=variant.language))
+        sections.append(_json_format(variant) if structured else self.free_text_format)
+        if variant.difficulty:
+            sections.append(
+                f'Pitch the vocabulary words at the "{variant.difficulty}" difficulty level.'
+            )
+        if avoid_words:
+            sections.append(
+                "These words were already used on recent days, so do not pick any of them "
+                f"as vocabulary words: {', '.join(avoid_words)}"
+            )
+        return RenderedPrompt(self.name, "\n\n".join(sections), structured)
+
+
+@lru_cache(maxsize=32)
+def _json_format(variant: ContentVariant) -> str:
+    return json_schema_prompt(variant)
+
+
+FULL = PromptTemplate(
+    "full",
+    body="""
+        datetime.now().isoformat() = {today}
+        overall theme = {theme}
+
+        You are a helpful "day start thoughts" assistant.
+        Provide {num_words} good words for us today that will help build our vocabulary.
+        Tell words that are not super common, but could be uncommon for non-native
+        english speakers. The overall theme contains some randomly picked words
+        the Operating System's words directory. You may use that as inspiration
+        to come up with the {num_words} words. Find literary words, words that you might
+        read in a novel, or sometimes find technical words. Stay close to the
+        theme and think about the psychological profile and stuff. you got this.
+        Let the date of the day affect your word selection choice a lot as well
+        so that there is uniqueness every single day.
+
+        First, write about today's theme - analyze the date and find out what is significant about today's date.
+        Analyze today from these perspectives and include the overall theme in some way:
+        - Significance of the numbers (from a numerology perspective)
+        - Significance of today's date (i.e. any important events in the past on the same day?)
+        - Significance about any past recent or future recent event/festivities around this
+        - The psychological make up of people around this date
+
+        After the theme analysis, provide {num_words} vocabulary words that relate to the day's themes.
+        For each word, provide:
+        - The word itself (in bold)
+        - Part of speech
+        - Clear definition
+        - Example sentence (if appropriate)
+    """,
+    second_language="""
+        Finally, provide a {language} word of the day. Since the user barely knows any {language},
+        give common words related to the English words or today's theme. For the {language} word, provide:
+        - The word in {language} script
+        - Pronunciation in English
+        - Part of speech
+        - Meaning in English
+    """,
+    free_text_format="""
+        Format your response naturally with clear sections. Use markdown formatting like **bold** for emphasis.
+        Don't mention the "overall theme" directly, but you may mention its synonyms if you want.
+
+        The response should flow naturally and be well-organized with clear headings for each section.
+
+        End your response with "By Light (@justanotherlight)" as the signature.
+    """,
+)
+
+COMPACT = PromptTemplate(
+    "compact",
+    body="""
+        Date: {today}
+        Theme words (random, for inspiration): {theme}
+
+        You are a "day start thoughts" assistant. First analyse today's date: its numerology,
+        past events on this day, nearby events or festivities, and the mood of people around
+        this date, weaving in the theme words. Then give {num_words} vocabulary words tied to
+        the day's theme: literary or occasionally technical words that non-native English
+        speakers rarely know, different every day. For each word give the word in bold, its
+        part of speech, a clear definition and an example sentence if it helps.
+    """,
+    second_language="""
+        Finally, give one common {language} word of the day related to the theme, for a beginner:
+        the word in {language} script, its pronunciation in English, part of speech and meaning in English.
+    """,
+    free_text_format="""
+        Use markdown with **bold** emphasis and a clear heading per section. Do not name the
+        theme words directly; synonyms are fine. End with "By Light (@justanotherlight)".
+    """,
+)
+
+PROMPT_TEMPLATES: Dict[str, PromptTemplate] = {template.name: template for template in (FULL, COMPACT)}
+
+
+def get_template(name: str) -> PromptTemplate:
+    """
+    Raises:
+        ConfigurationError: If there is no template called ``name``
+    """
+    try:
+        return PROMPT_TEMPLATES[name]
+    except KeyError:
+        raise ConfigurationError(
+            f"Unknown prompt template '{name}', expected one of {', '.join(PROMPT_TEMPLATES)}"
+        )
+
+
+def parse_prompt_experiment(spec: str) -> Dict[str, float]:
+    """
+    Parse ``template:weight`` entries separated by ``;``.
+
+    Raises:
+        ConfigurationError: If an entry is malformed or names an unknown template
+    """
+    weights: Dict[str, float] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(";"))):
+        name, _, weight = entry.partition(":")
+        get_template(name.strip())
+        try:
+            weights[name.strip()] = float(weight) if weight.strip() else 1.0
+        except ValueError:
+            raise ConfigurationError(f"Invalid prompt experiment entry '{entry}', expected template:weight")
+        if weights[name.strip()] < 0:
+            raise ConfigurationError(f"Invalid prompt experiment entry '{entry}', weight must not be negative")
+    if weights and sum(weights.values()) <= 0:
+        raise ConfigurationError("Prompt experiment needs at least one positive weight")
+    return weights
+
+
+def choose_template(default: str, experiment: Dict[str, float]) -> PromptTemplate:
+    """Pick the template for one generation: weighted at random in an experiment, else ``default``."""
+    if not experiment:
+        return get_template(default)
+    names = list(experiment)
+    return get_template(random.choices(names, weights=[experiment[name] for name in names])[0])
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config.settings import Settings
+
+
+@dataclass(frozen=True)
+class ContentVariant:
+    """The prompt options that make one chat's daily content differ from another's."""
+
+    language: str = "Tamil"
+    num_words: int = 5
+    difficulty: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used in cache keys and journals."""
+        return f"{self.language or 'none'}-{self.num_words}-{self.difficulty or 'default'}".lower()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ContentVariant":
+        return cls(language=settings.second_language, num_words=settings.num_words_to_send)
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Deque, List, Optional
+
+from ..utils.files import read_json, write_json_atomic
+from ..utils.logging import get_logger
+from ..utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Produces one new piece of content; may be slow (a live model call)
+ContentGenerator = Callable[[], Awaitable[str]]
+
+
+@dataclass
+class PooledContent:
+    """Content generated ahead of an on-demand request."""
+
+    content: str
+    created_at: float
+
+
+class ContentPool:
+    """
+    Pregenerated content kept warm for on-demand requests.
+
+    ``take`` never waits on generation: it hands out the oldest pooled item
+    and wakes the background refill task when the pool drops below its
+    low-water mark. The pool is persisted so it stays warm across restarts.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        generate: ContentGenerator,
+        capacity: int,
+        low_water: int,
+        max_age_seconds: float,
+        retry_delay_seconds: float = 30.0,
+    ):
+        self.path = path
+        self.generate = generate
+        self.capacity = capacity
+        self.low_water = min(low_water, capacity)
+        self.max_age_seconds = max_age_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.items: Deque[PooledContent] = deque(self._load(), maxlen=capacity)
+        self._refill_needed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def start(self) -> None:
+        """Start the background refill task and fill the pool up to capacity."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refill_forever())
+            self._refill_needed.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def take(self) -> Optional[str]:
+        """Hand out pooled content immediately, or None if the pool is empty."""
+        self._evict()
+        item = self.items.popleft() if self.items else None
+        metrics.inc(
+            "content_pool_requests", help="On-demand content requests", hit=str(item is not None).lower()
+        )
+        metrics.set("content_pool_size", len(self.items), help="Pregenerated on-demand content items")
+        if len(self.items) < self.low_water:
+            self._refill_needed.set()
+        if item is None:
+            return None
+        self.save()
+        return item.content
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.max_age_seconds
+        while self.items and self.items[0].created_at < cutoff:
+            self.items.popleft()
+            metrics.inc("content_pool_evictions", help="Pooled content dropped for age")
+
+    async def _refill_forever(self) -> None:
+        while True:
+            await self._refill_needed.wait()
+            self._refill_needed.clear()
+            self._evict()
+            while len(self.items) < self.capacity:
+                try:
+                    content = await self.generate()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("Content pool refill failed", error=str(e), size=len(self.items))
+                    await asyncio.sleep(self.retry_delay_seconds)
+                    continue
+                self.items.append(PooledContent(content=content, created_at=time.time()))
+                self.save()
+                metrics.set("content_pool_size", len(self.items), help="Pregenerated on-demand content items")
+            logger.info("Content pool full", size=len(self.items))
+
+    def _load(self) -> List[PooledContent]:
+        data = read_json(self.path)
+        if not isinstance(data, dict):
+            return []
+
+        items = []
+        for raw in data.get("items", []):
+            try:
+                items.append(PooledContent(**raw))
+            except TypeError:
+                continue
+        return items[-self.capacity:]
+
+    def save(self) -> None:
+        write_json_atomic(self.path, {"items": [asdict(item) for item in self.items]})
@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of delivering a message to a single chat."""
+
+    chat_id: int
+    success: bool
+    attempts: int
+    error: Optional[str] = None
+    parts: int = 1
+
+
+@dataclass
+class DeliveryReport:
+    """Per-chat results of a fan-out delivery."""
+
+    results: List[DeliveryResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[DeliveryResult]:
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self) -> List[DeliveryResult]:
+        return [result for result in self.results if not result.success]
+
+    def summary(self) -> dict:
+        return {
+            "total": len(self.results),
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "retried": sum(1 for result in self.results if result.attempts > result.parts),
+        }
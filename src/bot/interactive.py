@@ -0,0 +1,163 @@
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+from ..ai.content import load_content
+from ..config.settings import get_settings
+from ..utils.logging import get_logger
+from ..utils.metrics import metrics
+from .content_pool import ContentPool
+from .message_formatter import MessageFormatter
+
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import Application, ContextTypes
+
+logger = get_logger(__name__)
+
+# Returns the day's content for a chat without generating it, or None
+TodayContent = Callable[[int], Optional[str]]
+
+HELP_TEXT = (
+    "Send /today for today's words, /word for a single word "
+    "or /more for an extra set of words."
+)
+NOT_READY_TEXT = "Fresh words are still being prepared. Please try again in a few minutes."
+
+
+class InteractiveBot:
+    """
+    Answers /today, /word and /more on demand.
+
+    Every answer comes from already generated content (today's cached
+    content or the warm content pool), never from a live model call.
+    Updates are handled concurrently and each user has a cooldown.
+    """
+
+    def __init__(
+        self,
+        today_content: TodayContent,
+        pool: ContentPool,
+        formatter: MessageFormatter,
+        cooldown_seconds: float,
+    ):
+        self.today_content = today_content
+        self.pool = pool
+        self.formatter = formatter
+        self.cooldown_seconds = cooldown_seconds
+        self._last_request: Dict[int, float] = {}
+
+    def build_application(self) -> "Application":
+        # Imported here for the same reason as in TelegramClient
+        from telegram.ext import Application, CommandHandler
+
+        from .telegram_client import build_request
+
+        settings = get_settings()
+        application = (
+            Application.builder()
+            .token(settings.telegram_bot_token)
+            .base_url(settings.telegram_base_url)
+            .request(build_request())
+            .concurrent_updates(settings.interactive_max_concurrent_updates)
+            .build()
+        )
+        application.add_handler(CommandHandler(["start", "help"], self._help))
+        application.add_handler(CommandHandler("today", self._today))
+        application.add_handler(CommandHandler("word", self._word))
+        application.add_handler(CommandHandler("more", self._more))
+        return application
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Poll for updates until ``stop`` is set."""
+        application = self.build_application()
+        self.pool.start()
+        try:
+            async with application:
+                await application.start()
+                await application.updater.start_polling(drop_pending_updates=True)
+                logger.info("Interactive mode started", pool_size=len(self.pool))
+                await stop.wait()
+                await application.updater.stop()
+                await application.stop()
+        finally:
+            await self.pool.stop()
+            logger.info("Interactive mode stopped")
+
+    def _cooldown_remaining(self, user_id: int) -> float:
+        now = time.monotonic()
+        last = self._last_request.get(user_id)
+        if last is not None and now - last < self.cooldown_seconds:
+            return self.cooldown_seconds - (now - last)
+        self._last_request[user_id] = now
+        if len(self._last_request) > 10_000:
+            cutoff = now - self.cooldown_seconds
+            self._last_request = {
+                user: at for user, at in self._last_request.items() if at >= cutoff
+            }
+        return 0.0
+
+    async def _answer(self, update: "Update", command: str, build: Callable[[], Optional[str]]) -> None:
+        message = update.effective_message
+        user = update.effective_user
+        if message is None:
+            return
+
+        metrics.inc("interactive_requests", help="On-demand commands received", command=command)
+        remaining = self._cooldown_remaining(user.id if user else message.chat_id)
+        if remaining > 0:
+            metrics.inc("interactive_cooldowns", help="On-demand commands refused by the cooldown")
+            await message.reply_text(f"Please wait {remaining:.0f}s before asking again.")
+            return
+
+        with metrics.span("interactive_reply", command=command):
+            text = build()
+            if text is None:
+                await message.reply_text(NOT_READY_TEXT)
+                return
+            await self._reply(update, text)
+
+    async def _reply(self, update: "Update", text: str) -> None:
+        from telegram.error import BadRequest
+
+        payload = self.formatter.build_payload(self.formatter.format_daily_words_message(text))
+        for index in range(len(payload)):
+            part, parse_mode = payload.part(index)
+            try:
+                await update.effective_message.reply_text(part, parse_mode=parse_mode)
+            except BadRequest as e:
+                if parse_mode is None or "can't parse entities" not in str(e).lower():
+                    raise
+                payload.fall_back_to_plain(str(e))
+                await update.effective_message.reply_text(payload.part(index)[0])
+
+    def _todays(self, chat_id: int) -> Optional[str]:
+        return self.today_content(chat_id) or self.pool.take()
+
+    def _single_word(self, chat_id: int) -> Optional[str]:
+        # Pooled content is only taken when today's cannot answer
+        text = self.today_content(chat_id) or self.pool.take()
+        if text is None:
+            return None
+        content = load_content(text)
+        if content is None:
+            # Free-text content cannot be split into words
+            return text
+        word = random.choice(content.words)
+        return f"**Word of the moment**\n\n{word.to_markdown()}"
+
+    async def _help(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE") -> None:
+        if update.effective_message is not None:
+            await update.effective_message.reply_text(HELP_TEXT)
+
+    async def _today(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE") -> None:
+        chat_id = update.effective_chat.id
+        await self._answer(update, "today", lambda: self._todays(chat_id))
+
+    async def _word(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE") -> None:
+        chat_id = update.effective_chat.id
+        await self._answer(update, "word", lambda: self._single_word(chat_id))
+
+    async def _more(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE") -> None:
+        await self._answer(update, "more", self.pool.take)
@@ -0,0 +1,154 @@
+import asyncio
+import datetime
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+from ..utils.logging import get_logger
+from .delivery import DeliveryResult
+
+logger = get_logger(__name__)
+
+# Record types written to the journal
+_START = "start"
+_CONTENT = "content"
+_DELIVERY = "delivery"
+
+
+class DeliveryJournal:
+    """
+    Append-only, fsync'd log of one run date's content and per-chat deliveries.
+
+    Every record is a JSON line that is flushed and fsync'd before the append
+    returns, so a crashed or killed run leaves behind exactly what it finished.
+    Replaying the journal considers only the records after the latest start
+    marker; a torn final line from a crash mid-write is ignored.
+    """
+
+    def __init__(self, directory: str, run_date: datetime.date, shard: Optional[str] = None):
+        self.run_date = run_date
+        name = run_date.isoformat() if shard is None else f"{run_date.isoformat()}.{shard}"
+        self.path = os.path.join(directory, f"{name}.jsonl")
+        self.contents: Dict[str, str] = {}
+        self.delivered: Set[int] = set()
+        self.failed: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._torn_tail = False
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._replay()
+
+    def _replay(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+
+        # A crash mid-append leaves a partial last line; start the next record on a new one
+        self._torn_tail = bool(lines) and not lines[-1].endswith("\n")
+
+        for line_number, line in enumerate(lines, start=1):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("Skipping torn journal record", path=self.path, line=line_number)
+                continue
+
+            kind = record.get("type")
+            if kind == _START:
+                self.contents.clear()
+                self.delivered.clear()
+                self.failed.clear()
+            elif kind == _CONTENT:
+                self.contents[record.get("variant", "")] = record["content"]
+            elif kind == _DELIVERY:
+                chat_id = int(record["chat_id"])
+                if record["success"]:
+                    self.delivered.add(chat_id)
+                    self.failed.pop(chat_id, None)
+                elif chat_id not in self.delivered:
+                    self.failed[chat_id] = record.get("error") or "unknown error"
+
+        logger.info(
+            "Replayed delivery journal",
+            path=self.path,
+            variants=len(self.contents),
+            delivered=len(self.delivered),
+            failed=len(self.failed),
+        )
+
+    def _append(self, record: dict) -> None:
+        record["recorded_at"] = time.time()
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._torn_tail:
+                line = "\n" + line
+                self._torn_tail = False
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def pending(self, chat_ids: List[int]) -> List[int]:
+        """Return the chats in ``chat_ids`` that have not been delivered to yet."""
+        return [chat_id for chat_id in chat_ids if chat_id not in self.delivered]
+
+    def start(self) -> None:
+        """Begin a fresh run for this date, forgetting earlier content and deliveries."""
+        self._append({"type": _START})
+        self.contents.clear()
+        self.delivered.clear()
+        self.failed.clear()
+
+    def content_for(self, variant: str = "") -> Optional[str]:
+        """Return the journaled content for ``variant``, if any."""
+        return self.contents.get(variant)
+
+    def record_content(self, content: str, variant: str = "") -> None:
+        """Store the content every chat of ``variant`` is sent on this run date."""
+        self._append({"type": _CONTENT, "variant": variant, "content": content})
+        self.contents[variant] = content
+
+    async def record_delivery(self, result: DeliveryResult) -> None:
+        """Store one chat's delivery outcome without blocking the event loop on fsync."""
+        await asyncio.to_thread(
+            self._append,
+            {
+                "type": _DELIVERY,
+                "chat_id": result.chat_id,
+                "success": result.success,
+                "attempts": result.attempts,
+                "error": result.error,
+            },
+        )
+        if result.success:
+            self.delivered.add(result.chat_id)
+            self.failed.pop(result.chat_id, None)
+        else:
+            self.failed[result.chat_id] = result.error or "unknown error"
+
+
+def prune_journals(directory: str, retention_days: int) -> None:
+    """Delete journals for run dates older than ``retention_days``."""
+    cutoff = datetime.date.today() - datetime.timedelta(days=retention_days)
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+
+    for name in names:
+        stem, extension = os.path.splitext(name)
+        if extension != ".jsonl":
+            continue
+        try:
+            run_date = datetime.date.fromisoformat(stem.split(".", 1)[0])
+        except ValueError:
+            continue
+        if run_date < cutoff:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError as e:
+                logger.warning("Failed to prune delivery journal", name=name, error=str(e))
@@ -1,40 +1,310 @@
-from typing import Dict, Any, List
+import re
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
 
+from ..ai.content import load_content
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Telegram rejects messages longer than this many characters
+TELEGRAM_MESSAGE_LIMIT = 4096
+SIGNATURE = "By Light (@justanotherlight)"
+
+_MARKDOWN_V2_SPECIAL = set("_*[]()~`>#+-=|{}.!\\")
+_INLINE_PATTERN = re.compile(
+    r"`(?P<code>[^`\n]+)`"
+    r"|\*\*(?P<bold>.+?)\*\*"
+    r"|__(?P<bold_underscore>.+?)__"
+    r"|(?<![\w*])\*(?P<italic>[^*\s](?:[^*\n]*[^*\s])?)\*(?![\w*])"
+    r"|(?<![\w_])_(?P<italic_underscore>[^_\s](?:[^_\n]*[^_\s])?)_(?![\w_])"
+    r"|\[(?P<link_text>[^\]\n]+)\]\((?P<link_url>https?://[^)\s]+)\)"
+)
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(?P<text>.+?)\s*#*\s*$")
+_BULLET = re.compile(r"^(?P<indent>\s*)[-*+]\s+(?P<text>.*)$")
+_NUMBERED = re.compile(r"^(?P<indent>\s*)(?P<number>\d+)[.)]\s+(?P<text>.*)$")
+_QUOTE = re.compile(r"^\s*>\s?(?P<text>.*)$")
+_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+
+
+def escape_markdown_v2(text: str) -> str:
+    """Escape every character that is special in Telegram MarkdownV2."""
+    return "".join(f"\\{char}" if char in _MARKDOWN_V2_SPECIAL else char for char in text)
+
+
+def _escape_code(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("`", "\\`")
+
+
+def _escape_url(url: str) -> str:
+    return url.replace("\\", "\\\\").replace(")", "\\)")
+
+
+def _render_inline(text: str, markdown_v2: bool) -> str:
+    """Render inline markdown (bold, italic, code, links) for one parse mode."""
+    escape: Callable[[str], str] = escape_markdown_v2 if markdown_v2 else (lambda value: value)
+    output = []
+    position = 0
+    for match in _INLINE_PATTERN.finditer(text):
+        output.append(escape(text[position:match.start()]))
+        position = match.end()
+
+        groups = match.groupdict()
+        if groups["code"] is not None:
+            code = groups["code"]
+            output.append(f"`{_escape_code(code)}`" if markdown_v2 else code)
+        elif groups["bold"] is not None or groups["bold_underscore"] is not None:
+            inner = groups["bold"] if groups["bold"] is not None else groups["bold_underscore"]
+            # Nested markers are flattened: MarkdownV2 cannot nest bold in bold
+            inner = _render_inline(_strip_emphasis(inner), markdown_v2)
+            output.append(f"*{inner}*" if markdown_v2 else inner)
+        elif groups["italic"] is not None or groups["italic_underscore"] is not None:
+            inner = groups["italic"] if groups["italic"] is not None else groups["italic_underscore"]
+            output.append(f"_{escape(inner)}_" if markdown_v2 else inner)
+        else:
+            link_text, url = groups["link_text"], groups["link_url"]
+            if markdown_v2:
+                output.append(f"[{escape(link_text)}]({_escape_url(url)})")
+            else:
+                output.append(f"{link_text} ({url})")
+
+    output.append(escape(text[position:]))
+    return "".join(output)
+
+
+def _strip_emphasis(text: str) -> str:
+    return re.sub(r"(\*\*|__)(.+?)\1", r"\2", text)
+
+
+def _render_line(line: str, markdown_v2: bool) -> str:
+    """Render a single source line, including block-level markers."""
+    if _RULE.match(line):
+        return "——————"
+
+    heading = _HEADING.match(line)
+    if heading:
+        text = _render_inline(_strip_emphasis(heading.group("text")), markdown_v2=False)
+        return f"*{escape_markdown_v2(text)}*" if markdown_v2 else text
+
+    bullet = _BULLET.match(line)
+    if bullet:
+        return f"{bullet.group('indent')}• {_render_inline(bullet.group('text'), markdown_v2)}"
+
+    numbered = _NUMBERED.match(line)
+    if numbered:
+        marker = f"{numbered.group('number')}\\." if markdown_v2 else f"{numbered.group('number')}."
+        return f"{numbered.group('indent')}{marker} {_render_inline(numbered.group('text'), markdown_v2)}"
+
+    quote = _QUOTE.match(line)
+    if quote:
+        text = _render_inline(quote.group("text"), markdown_v2)
+        return f">{text}" if markdown_v2 else text
+
+    return _render_inline(line, markdown_v2)
+
+
+def _render_block(block: str, markdown_v2: bool) -> str:
+    return "\n".join(_render_line(line, markdown_v2) for line in block.split("\n"))
+
+
+def validate_markdown_v2(text: str) -> Optional[str]:
+    """
+    Check that ``text`` will be accepted by Telegram's MarkdownV2 parser.
+
+    Returns:
+        A description of the first problem found, or None if the text is valid
+    """
+    open_entities: List[str] = []
+    in_link_url = False
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char == "\\":
+            if index + 1 >= len(text):
+                return "trailing backslash"
+            index += 2
+            continue
+
+        in_code = bool(open_entities) and open_entities[-1] == "`"
+        if in_code and char != "`":
+            index += 1
+            continue
+
+        if in_link_url:
+            if char == ")":
+                in_link_url = False
+            index += 1
+            continue
+
+        if char in "*_~`":
+            if open_entities and open_entities[-1] == char:
+                open_entities.pop()
+            elif char in open_entities:
+                return f"overlapping '{char}' entities at position {index}"
+            else:
+                open_entities.append(char)
+        elif char == "[":
+            open_entities.append("[")
+        elif char == "]":
+            if not open_entities or open_entities[-1] != "[":
+                return f"unmatched ']' at position {index}"
+            open_entities.pop()
+            if not text.startswith("(", index + 1):
+                return f"link without URL at position {index}"
+            in_link_url = True
+            index += 1
+        elif char == ">" and (index == 0 or text[index - 1] == "\n"):
+            pass
+        elif char in _MARKDOWN_V2_SPECIAL:
+            return f"unescaped '{char}' at position {index}"
+        index += 1
+
+    if in_link_url:
+        return "unterminated link URL"
+    if open_entities:
+        return f"unclosed '{open_entities[-1]}' entity"
+    return None
+
+
+def _split_oversized(block: str, limit: int) -> List[str]:
+    """Split a block that cannot fit in one message at line, then word, boundaries."""
+    # Escaping at most doubles the length, so half the limit always fits
+    budget = limit // 2
+    pieces: List[str] = []
+    for line in block.split("\n"):
+        while len(line) > budget:
+            cut = line.rfind(" ", 0, budget)
+            cut = cut if cut > 0 else budget
+            pieces.append(line[:cut])
+            line = line[cut:].lstrip(" ")
+        pieces.append(line)
+    return pieces
+
+
+@dataclass
+class MessagePayload:
+    """
+    A message rendered once for every parse mode and split into parts that
+    fit Telegram's length limit. Both modes share the same part boundaries.
+    """
+
+    markdown_v2: List[str] = field(default_factory=list)
+    plain: List[str] = field(default_factory=list)
+    use_plain: bool = False
+
+    def __len__(self) -> int:
+        return len(self.plain)
+
+    def part(self, index: int) -> Tuple[str, Optional[str]]:
+        """Return the text and parse mode to send for part ``index``."""
+        if self.use_plain:
+            return self.plain[index], None
+        return self.markdown_v2[index], "MarkdownV2"
+
+    def fall_back_to_plain(self, reason: str) -> None:
+        """Switch every remaining send, for every chat, to plain text."""
+        if not self.use_plain:
+            logger.warning("Falling back to plain text messages", reason=reason)
+            self.use_plain = True
+
 
 class MessageFormatter:
     """Formats AI response into Telegram message."""
-    
+
+    def __init__(self, message_limit: int = TELEGRAM_MESSAGE_LIMIT):
+        self.message_limit = message_limit
+
     def format_daily_words_message(self, ai_text: str) -> str:
         """
         Format AI response into a readable Telegram message.
-        
+
+        Structured content is rendered to markdown first, so cached content can
+        be re-rendered without another model call.
+
         Args:
-            ai_text: Raw text response from AI
-            
+            ai_text: Raw text response from AI, or structured content as JSON
+
         Returns:
             Formatted message string
         """
         try:
+            content = load_content(ai_text)
+            if content is not None:
+                ai_text = content.to_markdown()
+
             # The AI should provide well-formatted text, so we just need to add our signature
             # and ensure proper formatting for Telegram
             formatted_message = ai_text.strip()
-            
+
             # Ensure there's a nice header
             if not formatted_message.startswith("Today's") and not formatted_message.startswith("**Today's"):
                 formatted_message = "Today's words:\n\n" + formatted_message
-            
+
             # Add signature at the end
-            if not formatted_message.endswith("By Light"):
-                formatted_message += "\n\n\nBy Light (@justanotherlight)"
-            
+            if not formatted_message.endswith(("By Light", SIGNATURE)):
+                formatted_message += f"\n\n\n{SIGNATURE}"
+
             logger.info("Successfully formatted message", message_length=len(formatted_message))
-            
+
             return formatted_message
-            
+
         except Exception as e:
             logger.error("Error formatting message", error=str(e))
-            raise
\ No newline at end of file
+            raise
+
+    def build_payload(self, message: str) -> MessagePayload:
+        """
+        Render a formatted message once for every parse mode.
+
+        The markdown is converted to escaped MarkdownV2 and to plain text, and
+        both are split into parts at section boundaries so no part exceeds
+        Telegram's limit. If the MarkdownV2 rendering fails validation, the
+        payload is marked to use plain text from the start.
+
+        Args:
+            message: Formatted message from format_daily_words_message
+
+        Returns:
+            Payload to reuse for every recipient
+        """
+        blocks: List[str] = []
+        for section in re.split(r"\n\s*\n", message.strip()):
+            if len(section) > self.message_limit // 2:
+                blocks.extend(_split_oversized(section, self.message_limit))
+            else:
+                blocks.append(section)
+
+        payload = MessagePayload()
+        current_v2: List[str] = []
+        current_plain: List[str] = []
+        for block in blocks:
+            rendered_v2 = _render_block(block, markdown_v2=True)
+            rendered_plain = _render_block(block, markdown_v2=False)
+            fits = (
+                len("\n\n".join(current_v2 + [rendered_v2])) <= self.message_limit
+                and len("\n\n".join(current_plain + [rendered_plain])) <= self.message_limit
+            )
+            if current_v2 and not fits:
+                payload.markdown_v2.append("\n\n".join(current_v2))
+                payload.plain.append("\n\n".join(current_plain))
+                current_v2, current_plain = [], []
+            current_v2.append(rendered_v2)
+            current_plain.append(rendered_plain)
+
+        if current_v2:
+            payload.markdown_v2.append("\n\n".join(current_v2))
+            payload.plain.append("\n\n".join(current_plain))
+
+        for index, part in enumerate(payload.markdown_v2):
+            problem = validate_markdown_v2(part)
+            if problem is not None:
+                payload.fall_back_to_plain(f"part {index}: {problem}")
+                break
+
+        logger.info(
+            "Built message payload",
+            parts=len(payload),
+            markdown_v2_length=sum(len(part) for part in payload.markdown_v2),
+            plain_text=payload.use_plain,
+        )
+        return payload
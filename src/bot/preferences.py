@@ -0,0 +1,72 @@
+import json
+from typing import Dict, List
+
+from ..ai.variants import ContentVariant
+from ..utils.exceptions import ConfigurationError
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ChatPreferences:
+    """
+    Per-chat content preferences loaded from a JSON file.
+
+    The file maps chat IDs to any of ``language``, ``num_words`` and
+    ``difficulty``; anything a chat leaves out comes from the default variant:
+
+        {"123456": {"language": "Hindi", "num_words": 3, "difficulty": "common"}}
+    """
+
+    def __init__(self, path: str, default: ContentVariant):
+        self.path = path
+        self.default = default
+        self._variants: Dict[int, ContentVariant] = self._load() if path else {}
+
+    def _load(self) -> Dict[int, ContentVariant]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            logger.warning("Chat preferences file not found", path=self.path)
+            return {}
+        except (OSError, ValueError) as e:
+            raise ConfigurationError(f"Cannot read chat preferences from {self.path}: {e}")
+
+        # Chats with identical preferences share one variant instance
+        interned: Dict[ContentVariant, ContentVariant] = {}
+        variants: Dict[int, ContentVariant] = {}
+        for chat_id, options in data.items():
+            try:
+                variant = ContentVariant(
+                    language=str(options.get("language", self.default.language)),
+                    num_words=int(options.get("num_words", self.default.num_words)),
+                    difficulty=options.get("difficulty", self.default.difficulty),
+                )
+                chat_id = int(chat_id)
+            except (AttributeError, TypeError, ValueError) as e:
+                raise ConfigurationError(f"Invalid preferences for chat {chat_id}: {e}")
+            if variant.num_words < 1:
+                raise ConfigurationError(f"Invalid preferences for chat {chat_id}: num_words must be positive")
+            variants[chat_id] = interned.setdefault(variant, variant)
+
+        logger.info("Loaded chat preferences", chats=len(variants), variants=len(interned))
+        return variants
+
+    def variant_for(self, chat_id: int) -> ContentVariant:
+        return self._variants.get(chat_id, self.default)
+
+    def variants(self) -> List[ContentVariant]:
+        """Every distinct variant, starting with the default."""
+        distinct = [self.default]
+        for variant in self._variants.values():
+            if variant not in distinct:
+                distinct.append(variant)
+        return distinct
+
+    def group(self, chat_ids: List[int]) -> Dict[ContentVariant, List[int]]:
+        """Group chats by the variant of content they should receive."""
+        groups: Dict[ContentVariant, List[int]] = {}
+        for chat_id in chat_ids:
+            groups.setdefault(self.variant_for(chat_id), []).append(chat_id)
+        return groups
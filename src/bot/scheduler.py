@@ -0,0 +1,187 @@
+import asyncio
+import datetime
+import signal
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ..config.settings import Settings
+from ..utils.exceptions import ConfigurationError
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Callback invoked for a due slot with its chat IDs (None for every subscriber)
+# and local delivery date
+SlotHandler = Callable[[Optional[List[int]], datetime.date], Awaitable[None]]
+
+# Callback invoked shortly before a slot is due, e.g. to open connections
+WarmUp = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class DeliverySlot:
+    """A local send time shared by a group of chats, or by every subscriber if ``chat_ids`` is None."""
+
+    send_time: datetime.time
+    timezone: str
+    chat_ids: Optional[List[int]] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return f"{self.send_time.strftime('%H:%M')}@{self.timezone}"
+
+    @property
+    def tzinfo(self) -> ZoneInfo:
+        return ZoneInfo(self.timezone)
+
+    def next_run(self, after: datetime.datetime) -> datetime.datetime:
+        """Return the first send time strictly after ``after`` (timezone-aware)."""
+        local_after = after.astimezone(self.tzinfo)
+        candidate = datetime.datetime.combine(local_after.date(), self.send_time, tzinfo=self.tzinfo)
+        if candidate <= after:
+            next_day = local_after.date() + datetime.timedelta(days=1)
+            candidate = datetime.datetime.combine(next_day, self.send_time, tzinfo=self.tzinfo)
+        return candidate
+
+
+def parse_delivery_slots(settings: Settings) -> List[DeliverySlot]:
+    """
+    Build delivery slots from ``DELIVERY_SCHEDULE``.
+
+    The schedule is a ``;``-separated list of ``HH:MM[@Zone][=chat_id,...]``
+    entries. Entries without chat IDs use all configured chats (streamed from
+    ``SUBSCRIBERS_SOURCE`` when one is set), entries without
+    a zone use ``DAEMON_DEFAULT_TIMEZONE``. Entries with the same time and zone
+    are merged into a single slot.
+
+    Raises:
+        ConfigurationError: If the schedule cannot be parsed
+    """
+    entries = [entry.strip() for entry in settings.delivery_schedule_str.split(";") if entry.strip()]
+    if not entries:
+        entries = [settings.daemon_default_send_time]
+
+    slots: Dict[tuple, DeliverySlot] = {}
+    for entry in entries:
+        spec, _, chats = entry.partition("=")
+        time_str, _, zone = spec.partition("@")
+        zone = zone.strip() or settings.daemon_default_timezone
+        try:
+            send_time = datetime.time.fromisoformat(time_str.strip())
+            ZoneInfo(zone)
+            if chats.strip():
+                chat_ids = [int(cid.strip()) for cid in chats.split(",") if cid.strip()]
+            elif settings.subscribers_source.strip():
+                chat_ids = None
+            else:
+                chat_ids = settings.telegram_chat_ids
+        except (ValueError, ZoneInfoNotFoundError) as e:
+            raise ConfigurationError(f"Invalid delivery schedule entry '{entry}': {e}")
+
+        slot = slots.setdefault((send_time, zone), DeliverySlot(send_time, zone))
+        if chat_ids is None:
+            slot.chat_ids = None
+        elif slot.chat_ids is not None:
+            slot.chat_ids.extend(cid for cid in chat_ids if cid not in slot.chat_ids)
+
+    return [slot for slot in slots.values() if slot.chat_ids is None or slot.chat_ids]
+
+
+class DeliveryScheduler:
+    """Runs slot handlers at each slot's local send time until stopped."""
+
+    def __init__(
+        self,
+        slots: List[DeliverySlot],
+        handler: SlotHandler,
+        warm_up: Optional[WarmUp] = None,
+        warm_up_seconds: float = 0.0,
+    ):
+        """
+        Args:
+            slots: Delivery slots to run
+            handler: Awaited with each due slot's chats and local date
+            warm_up: Awaited ``warm_up_seconds`` before each slot is due
+            warm_up_seconds: Lead time for ``warm_up``, 0 disables it
+        """
+        if not slots:
+            raise ConfigurationError("No delivery slots configured")
+        self.slots = slots
+        self.handler = handler
+        self.warm_up = warm_up
+        self.warm_up_seconds = warm_up_seconds
+        self._stop = asyncio.Event()
+        self._last_fired: Dict[str, datetime.datetime] = {}
+        self._running: Set[asyncio.Task] = set()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def install_signal_handlers(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+
+    def _next_run(self, slot: DeliverySlot, now: datetime.datetime) -> datetime.datetime:
+        # Never fire the same occurrence twice if the timer wakes up early
+        last_fired = self._last_fired.get(slot.name)
+        return slot.next_run(max(now, last_fired) if last_fired else now)
+
+    async def run_forever(self) -> None:
+        logger.info("Scheduler started", slots=[slot.name for slot in self.slots])
+        while not self._stop.is_set():
+            now = datetime.datetime.now(datetime.timezone.utc)
+            upcoming = [(self._next_run(slot, now), slot) for slot in self.slots]
+            fire_at = min(run_at for run_at, _ in upcoming)
+
+            logger.info("Waiting for next delivery slot", fire_at=fire_at.isoformat())
+            if self.warm_up is not None and self.warm_up_seconds > 0:
+                warm_up_at = fire_at - datetime.timedelta(seconds=self.warm_up_seconds)
+                if warm_up_at > now:
+                    if await self._wait_until(warm_up_at):
+                        break
+                    await self._warm_up()
+            if await self._wait_until(fire_at):
+                break
+
+            for run_at, slot in upcoming:
+                if run_at <= fire_at:
+                    self._last_fired[slot.name] = run_at
+                    self._start(slot, run_at.astimezone(slot.tzinfo).date())
+
+        if self._running:
+            logger.info("Waiting for in-flight deliveries", count=len(self._running))
+            await asyncio.gather(*self._running, return_exceptions=True)
+        logger.info("Scheduler stopped")
+
+    async def _wait_until(self, when: datetime.datetime) -> bool:
+        """Sleep until ``when``; returns True if the scheduler was stopped first."""
+        delay = (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=max(0.0, delay))
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _warm_up(self) -> None:
+        try:
+            await self.warm_up()
+        except Exception as e:
+            logger.warning("Warm-up before delivery failed", error=str(e))
+
+    def _start(self, slot: DeliverySlot, local_date: datetime.date) -> None:
+        task = asyncio.create_task(self._fire(slot, local_date))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _fire(self, slot: DeliverySlot, local_date: datetime.date) -> None:
+        logger.info(
+            "Delivery slot due",
+            slot=slot.name,
+            chat_count=len(slot.chat_ids) if slot.chat_ids is not None else "all",
+        )
+        try:
+            await self.handler(slot.chat_ids, local_date)
+        except Exception as e:
+            logger.error("Delivery slot failed", slot=slot.name, error=str(e))
@@ -0,0 +1,135 @@
+import hashlib
+import sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List
+
+from ..config.settings import Settings
+from ..utils.exceptions import ConfigurationError
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def shard_of(chat_id: int, shard_count: int) -> int:
+    """Return the shard a chat belongs to, stable across processes and hosts."""
+    digest = hashlib.blake2b(str(chat_id).encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """The slice of subscribers handled by one worker process or host."""
+
+    index: int = 0
+    count: int = 1
+
+    def __post_init__(self):
+        if self.count < 1 or not 0 <= self.index < self.count:
+            raise ConfigurationError(f"Invalid shard {self.index} of {self.count}")
+
+    @property
+    def name(self) -> str:
+        return f"shard-{self.index}-of-{self.count}"
+
+    def owns(self, chat_id: int) -> bool:
+        return self.count == 1 or shard_of(chat_id, self.count) == self.index
+
+    def filter(self, chat_ids: Iterable[int]) -> List[int]:
+        return [chat_id for chat_id in chat_ids if self.owns(chat_id)]
+
+
+class SubscriberSource(ABC):
+    """Streams subscriber chat IDs in batches."""
+
+    @abstractmethod
+    def iter_batches(self, batch_size: int) -> Iterator[List[int]]:
+        """Yield chat IDs in lists of at most ``batch_size``."""
+
+
+class EnvSubscriberSource(SubscriberSource):
+    """Chat IDs from ``TELEGRAM_CHAT_IDS``."""
+
+    def __init__(self, chat_ids: List[int]):
+        self.chat_ids = chat_ids
+
+    def iter_batches(self, batch_size: int) -> Iterator[List[int]]:
+        for start in range(0, len(self.chat_ids), batch_size):
+            yield self.chat_ids[start:start + batch_size]
+
+
+class FileSubscriberSource(SubscriberSource):
+    """One chat ID per line; blank lines and ``#`` comments are skipped."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def iter_batches(self, batch_size: int) -> Iterator[List[int]]:
+        batch: List[int] = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                value = line.split("#", 1)[0].strip()
+                if not value:
+                    continue
+                try:
+                    batch.append(int(value))
+                except ValueError:
+                    logger.warning("Skipping invalid chat ID", path=self.path, line=line_number)
+                    continue
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+
+class SqliteSubscriberSource(SubscriberSource):
+    """
+    Chat IDs from a SQLite ``subscribers`` table.
+
+    The table needs a ``chat_id`` column; rows with an ``active`` column set
+    to 0 are skipped when that column exists.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def iter_batches(self, batch_size: int) -> Iterator[List[int]]:
+        connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(subscribers)")}
+            if "chat_id" not in columns:
+                raise ConfigurationError(f"No subscribers(chat_id) table in {self.path}")
+            query = "SELECT chat_id FROM subscribers"
+            if "active" in columns:
+                query += " WHERE active != 0"
+            cursor = connection.execute(query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [int(chat_id) for (chat_id,) in rows]
+        finally:
+            connection.close()
+
+
+def open_subscriber_source(settings: Settings) -> SubscriberSource:
+    """
+    Build the subscriber source named by ``SUBSCRIBERS_SOURCE``.
+
+    An empty value uses ``TELEGRAM_CHAT_IDS``; ``file:PATH`` and
+    ``sqlite:PATH`` read a chat ID list or a SQLite database.
+
+    Raises:
+        ConfigurationError: If the source is not recognised
+    """
+    source = settings.subscribers_source.strip()
+    if not source:
+        return EnvSubscriberSource(settings.telegram_chat_ids)
+
+    kind, _, path = source.partition(":")
+    if kind == "file" and path:
+        return FileSubscriberSource(path)
+    if kind == "sqlite" and path:
+        return SqliteSubscriberSource(path)
+    raise ConfigurationError(f"Unsupported subscriber source '{source}'")
@@ -1,52 +1,241 @@
-from telegram import Bot
-from telegram.error import TelegramError
-from typing import List
+import asyncio
+import datetime
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, Tuple
 
-from ..config.settings import settings
+from ..config.settings import get_settings
+from ..utils.deadline import Deadline
 from ..utils.exceptions import TelegramBotError
 from ..utils.logging import get_logger
+from ..utils.metrics import metrics
+from ..utils.rate_limiter import KeyedTokenBuckets, TokenBucket
+from .delivery import DeliveryReport, DeliveryResult
+from .message_formatter import MessagePayload
+
+if TYPE_CHECKING:
+    from telegram.error import RetryAfter
+    from telegram.request import HTTPXRequest
 
 logger = get_logger(__name__)
 
+# Called with each chat's result as soon as that chat is finished
+ResultCallback = Callable[[DeliveryResult], Awaitable[None]]
+
+
+def build_request() -> "HTTPXRequest":
+    """Telegram API request handler on the process-wide HTTP transport."""
+    from telegram.request import HTTPXRequest
+
+    from ..utils.http import get_http_transport
+
+    settings = get_settings()
+    return HTTPXRequest(
+        connect_timeout=settings.http_connect_timeout_seconds,
+        read_timeout=settings.http_read_timeout_seconds,
+        write_timeout=settings.http_read_timeout_seconds,
+        pool_timeout=settings.http_connect_timeout_seconds,
+        httpx_kwargs={"transport": get_http_transport()},
+    )
+
+
+def _retry_after_seconds(error: "RetryAfter") -> float:
+    retry_after = error.retry_after
+    if isinstance(retry_after, datetime.timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
 
 class TelegramClient:
     """Handles Telegram bot operations."""
-    
-    def __init__(self):
-        self.bot = Bot(token=settings.telegram_bot_token)
-        self.chat_ids = settings.telegram_chat_ids
-    
-    async def send_message(self, message: str) -> None:
+
+    def __init__(self, rate_share: float = 1.0):
+        """
+        Args:
+            rate_share: Fraction of the bot-wide rate limit this process may use,
+                such as 1/N for one of N delivery shards
         """
-        Send message to all configured Telegram chats.
-        
+        # Imported here: python-telegram-bot is slow to import and only needed
+        # once a client is actually constructed
+        from telegram import Bot
+
+        self.settings = get_settings()
+        self.bot = Bot(
+            token=self.settings.telegram_bot_token,
+            base_url=self.settings.telegram_base_url,
+            request=build_request(),
+        )
+        self.chat_ids = self.settings.telegram_chat_ids
+        self.global_limiter = TokenBucket(
+            self.settings.telegram_global_rate_per_second * rate_share
+        )
+        self.chat_limiters = KeyedTokenBuckets(self.settings.telegram_per_chat_rate_per_second, 1.0)
+
+    async def send_message(
+        self,
+        payload: MessagePayload,
+        chat_ids: Optional[List[int]] = None,
+        on_result: Optional[ResultCallback] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> DeliveryReport:
+        """
+        Send a rendered payload to all configured Telegram chats concurrently.
+
+        Delivery is bounded by a concurrency limit and by token buckets for the
+        bot-wide and per-chat rate limits. A failing chat does not stop delivery
+        to the others.
+
         Args:
-            message: Message to send
-            
+            payload: Rendered message, shared by every chat
+            chat_ids: Chats to send to, defaults to all configured chats
+            on_result: Awaited with each chat's result as it completes
+            deadline: After it passes, chats get a single attempt and no retries
+
+        Returns:
+            Per-chat delivery report
+
         Raises:
-            TelegramBotError: If sending fails
+            TelegramBotError: If the client is not configured
         """
-        if not settings.telegram_bot_token:
+        if not self.settings.telegram_bot_token:
             raise TelegramBotError("Telegram bot token is not configured")
-        
-        if not self.chat_ids:
+
+        chat_ids = chat_ids if chat_ids is not None else self.chat_ids
+        if not chat_ids:
             raise TelegramBotError("No Telegram chat IDs configured")
-        
-        logger.info("Sending message to Telegram chats", chat_count=len(self.chat_ids))
-        
-        for chat_id in self.chat_ids:
-            try:
-                await self.bot.send_message(
-                    chat_id=chat_id, 
-                    text=message, 
-                    parse_mode="Markdown"
+
+        logger.info("Sending message to Telegram chats", chat_count=len(chat_ids))
+
+        semaphore = asyncio.Semaphore(self.settings.telegram_max_concurrent_sends)
+
+        async def deliver(chat_id: int) -> DeliveryResult:
+            async with semaphore:
+                result = await self._send_to_chat(chat_id, payload, deadline)
+            if on_result is not None:
+                await on_result(result)
+            return result
+
+        with metrics.span("delivery"):
+            report = DeliveryReport(
+                results=list(await asyncio.gather(*(deliver(chat_id) for chat_id in chat_ids)))
+            )
+        # A long-running process would otherwise keep a bucket for every chat
+        # it ever sent to
+        self.chat_limiters.prune()
+        metrics.inc("telegram_messages_sent", len(report.succeeded), help="Chats delivered to")
+        metrics.inc(
+            "telegram_send_failures", len(report.failed), help="Chats that could not be delivered to"
+        )
+
+        if report.failed:
+            logger.error("Some messages failed to send", **report.summary())
+        else:
+            logger.info("All messages sent successfully", **report.summary())
+        return report
+
+    async def close(self) -> None:
+        """Shut the bot down; the shared connection pool stays open."""
+        await self.bot.shutdown()
+
+    async def _send_to_chat(
+        self, chat_id: int, payload: MessagePayload, deadline: Optional[Deadline] = None
+    ) -> DeliveryResult:
+        """Send every part of the payload to one chat, stopping at the first failed part."""
+        total_attempts = 0
+        for index in range(len(payload)):
+            sent, attempts, error = await self._send_part(chat_id, payload, index, deadline)
+            total_attempts += attempts
+            if not sent:
+                return DeliveryResult(
+                    chat_id=chat_id,
+                    success=False,
+                    attempts=total_attempts,
+                    error=error,
+                    parts=len(payload),
                 )
-                logger.info("Message sent successfully", chat_id=chat_id)
-            except TelegramError as e:
+
+        logger.info(
+            "Message sent successfully", chat_id=chat_id, parts=len(payload), attempts=total_attempts
+        )
+        return DeliveryResult(
+            chat_id=chat_id, success=True, attempts=total_attempts, parts=len(payload)
+        )
+
+    async def _send_part(
+        self,
+        chat_id: int,
+        payload: MessagePayload,
+        index: int,
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[bool, int, Optional[str]]:
+        """
+        Send one part, honouring rate limits and retrying transient errors.
+
+        Retries stop once ``deadline`` has passed, and waits before a retry
+        never extend past it.
+        """
+        from telegram.error import BadRequest, Forbidden, RetryAfter, TelegramError
+
+        chat_limiter = self.chat_limiters.get(chat_id)
+        attempts = 0
+        error_message = None
+
+        # Resending as plain text is not a retry: it uses no attempt and
+        # happens regardless of the deadline
+        resend = False
+        while resend or attempts < self.settings.telegram_max_send_attempts:
+            if attempts and not resend and deadline is not None and deadline.expired():
+                metrics.inc("telegram_deadline_exceeded", help="Chats whose retries were cut by the deadline")
+                logger.error(
+                    "Out of time to retry message", chat_id=chat_id, attempts=attempts, error=error_message
+                )
+                return False, attempts, error_message
+            if not resend:
+                attempts += 1
+                if attempts > 1:
+                    metrics.inc("telegram_retries", help="Telegram send retries")
+            resend = False
+            await chat_limiter.acquire()
+            await self.global_limiter.acquire()
+            text, parse_mode = payload.part(index)
+            try:
+                with metrics.span("telegram_send"):
+                    await self.bot.send_message(
+                        chat_id=chat_id,
+                        text=text,
+                        parse_mode=parse_mode
+                    )
+                return True, attempts, None
+            except RetryAfter as e:
+                metrics.inc("telegram_rate_limited", help="Telegram sends rejected with RetryAfter")
+                delay = _retry_after_seconds(e)
+                error_message = str(e)
+                if deadline is not None and delay > deadline.remaining():
+                    logger.error("Rate limited past the deadline", chat_id=chat_id, retry_after=delay)
+                    return False, attempts, error_message
+                chat_limiter.pause(delay)
+                logger.warning("Rate limited by Telegram", chat_id=chat_id, retry_after=delay)
+            except BadRequest as e:
+                error_message = str(e)
+                if parse_mode is not None and "can't parse entities" in error_message.lower():
+                    # Shared by all chats, so the markup only fails once per payload
+                    payload.fall_back_to_plain(error_message)
+                    resend = True
+                    continue
+                logger.error("Failed to send message", chat_id=chat_id, error=error_message)
+                return False, attempts, error_message
+            except Forbidden as e:
+                # Permanent errors: retrying will not help
                 logger.error("Failed to send message", chat_id=chat_id, error=str(e))
-                raise TelegramBotError(f"Failed to send message to chat {chat_id}: {e}")
+                return False, attempts, str(e)
+            except TelegramError as e:
+                error_message = str(e)
+                logger.warning("Transient error sending message", chat_id=chat_id, error=error_message)
+                backoff = self.settings.telegram_retry_backoff_seconds * 2 ** (attempts - 1)
+                if deadline is not None:
+                    backoff = min(backoff, deadline.remaining())
+                await asyncio.sleep(backoff)
             except Exception as e:
                 logger.error("Unexpected error sending message", chat_id=chat_id, error=str(e))
-                raise TelegramBotError(f"Unexpected error for chat {chat_id}: {e}")
-        
-        logger.info("All messages sent successfully")
\ No newline at end of file
+                return False, attempts, str(e)
+
+        logger.error("Failed to send message", chat_id=chat_id, attempts=attempts, error=error_message)
+        return False, attempts, error_message
@@ -1,3 +1,4 @@
+from functools import cached_property, lru_cache
 from typing import List
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
@@ -10,7 +11,68 @@ class Settings(BaseSettings):
     telegram_chat_ids_str: str = Field(
         default="", description="Comma-separated list of Telegram chat IDs"
     )
+    subscribers_source: str = Field(
+        default="",
+        description="Subscriber chat IDs: empty for TELEGRAM_CHAT_IDS, file:PATH or sqlite:PATH",
+    )
+    subscribers_batch_size: int = Field(
+        default=1000, description="Subscribers read and delivered per batch"
+    )
+    shard_content_wait_seconds: float = Field(
+        default=300.0,
+        description="How long shards other than 0 wait for the shared content to be cached",
+    )
+    telegram_base_url: str = Field(
+        default="https://api.telegram.org/bot", description="Telegram Bot API base URL"
+    )
+    telegram_max_concurrent_sends: int = Field(
+        default=32, description="Maximum number of Telegram sends in flight"
+    )
+    telegram_global_rate_per_second: float = Field(
+        default=25.0, description="Bot-wide Telegram message rate limit"
+    )
+    telegram_per_chat_rate_per_second: float = Field(
+        default=1.0, description="Per-chat Telegram message rate limit"
+    )
+    telegram_max_send_attempts: int = Field(
+        default=3, description="Maximum send attempts per chat"
+    )
+    telegram_retry_backoff_seconds: float = Field(
+        default=1.0, description="Initial backoff after a transient Telegram error"
+    )
+    http_max_connections: int = Field(
+        default=100, description="Connections the shared HTTP pool may open"
+    )
+    http_max_keepalive_connections: int = Field(
+        default=40, description="Idle connections the shared HTTP pool keeps open"
+    )
+    http_keepalive_expiry_seconds: float = Field(
+        default=300.0, description="How long an idle pooled connection is kept"
+    )
+    enable_http2: bool = Field(
+        default=False, description="Use HTTP/2 where the server supports it (needs h2)"
+    )
+    http_connect_timeout_seconds: float = Field(
+        default=10.0, description="Timeout for opening a connection, DNS and TLS included"
+    )
+    http_read_timeout_seconds: float = Field(
+        default=30.0, description="Timeout for reading a Telegram API response"
+    )
+    http_total_timeout_seconds: float = Field(
+        default=120.0,
+        description="Upper bound on connecting, sending a request and receiving its response headers",
+    )
+    dns_cache_ttl_seconds: float = Field(
+        default=300.0, description="How long resolved host addresses are reused (0 disables caching)"
+    )
+    http_prewarm_seconds: float = Field(
+        default=30.0,
+        description="Seconds before a daemon slot that connections are opened (0 disables pre-warming)",
+    )
     openrouter_api_key: str = Field(..., description="OpenRouter API key")
+    openrouter_base_url: str = Field(
+        default="https://openrouter.ai/api/v1", description="OpenRouter API base URL"
+    )
     available_models: List[str] = Field(
         default=[
             "z-ai/glm-4.5-air:free",
@@ -24,18 +86,208 @@ class Settings(BaseSettings):
     enable_model_rotation: bool = Field(
         default=True, description="Enable random model selection"
     )
+    model_stats_path: str = Field(
+        default=".cache/model_stats.json",
+        description="Path to the persisted per-model latency and health statistics",
+    )
+    model_latency_ewma_alpha: float = Field(
+        default=0.3, description="Smoothing factor for the per-model latency EWMA"
+    )
+    model_exploration_rate: float = Field(
+        default=0.1,
+        description="Probability of picking a model uniformly instead of by score",
+    )
+    model_circuit_failure_threshold: int = Field(
+        default=3, description="Consecutive failures that open a model's circuit breaker"
+    )
+    model_circuit_cooldown_seconds: float = Field(
+        default=6 * 60 * 60, description="How long an open circuit keeps a model out of rotation"
+    )
     max_retry_attempts: int = Field(
         default=3, description="Maximum retry attempts with different models"
     )
+    ai_request_timeout_seconds: float = Field(
+        default=60.0, description="Timeout for a single AI completion request"
+    )
+    ai_max_tokens: int = Field(
+        default=4000, description="Completion token cap for free-text responses (0 leaves it to the model)"
+    )
+    ai_structured_max_tokens: int = Field(
+        default=3000, description="Completion token cap for structured JSON responses (0 leaves it to the model)"
+    )
+    prompt_template: str = Field(
+        default="full", description="Prompt template to use: full or compact"
+    )
+    prompt_experiment_str: str = Field(
+        default="",
+        description="';'-separated template:weight entries to A/B test prompt templates (empty disables it)",
+    )
+    prompt_stats_path: str = Field(
+        default=".cache/prompt_stats.json",
+        description="File where per-template latency, token and validation stats are kept",
+    )
+    enable_structured_output: bool = Field(
+        default=False,
+        description="Ask models for schema-validated JSON content instead of free text",
+    )
+    enable_streaming: bool = Field(
+        default=False,
+        description="Stream completions and abort slow or stalled models early",
+    )
+    stream_first_token_timeout_seconds: float = Field(
+        default=20.0, description="Deadline for the first streamed token of a completion"
+    )
+    stream_stall_timeout_seconds: float = Field(
+        default=10.0, description="Maximum gap between streamed chunks before aborting"
+    )
+    enable_hedged_requests: bool = Field(
+        default=False,
+        description="Start a second model in parallel when the first one is slow",
+    )
+    hedge_latency_percentile: float = Field(
+        default=0.9,
+        description="Observed latency percentile after which a hedged request is started",
+    )
+    hedge_default_delay_seconds: float = Field(
+        default=10.0,
+        description="Hedge delay used until enough latency samples are available",
+    )
+    hedge_max_parallel_requests: int = Field(
+        default=2, description="Maximum number of models queried in parallel when hedging"
+    )
     words_file_path: str = Field(
         default="/usr/share/dict/words", description="Path to system dictionary file"
     )
+    word_index_path: str = Field(
+        default=".cache/words.idx",
+        description="Path to the offset index built from the dictionary file",
+    )
+    word_frequency_file_path: str = Field(
+        default="",
+        description="Word frequency list ('word [count]' per line) for weighted sampling (empty samples uniformly)",
+    )
+    word_difficulty_bands_str: str = Field(
+        default="common:1-3000;literary:3000-30000;obscure:30000-",
+        description="Difficulty bands as ';'-separated name:min_rank-max_rank entries",
+    )
+    word_difficulty: str = Field(
+        default="literary", description="Difficulty band theme words are drawn from"
+    )
+    word_frequency_exponent: float = Field(
+        default=0.0,
+        description="Words in a band are weighted by rank ** -exponent (0 samples the band uniformly)",
+    )
+    content_cache_path: str = Field(
+        default=".cache/content_cache.json",
+        description="Path to the cache of pregenerated daily content",
+    )
+    content_cache_ttl_days: int = Field(
+        default=2, description="Days after its send date that cached content expires"
+    )
+    content_cache_max_entries: int = Field(
+        default=60, description="Maximum number of cached content entries"
+    )
+    history_db_path: str = Field(
+        default=".cache/history.sqlite3",
+        description="SQLite database of previously used theme and vocabulary words",
+    )
+    history_window_days: int = Field(
+        default=365, description="How far back used words are avoided"
+    )
+    history_max_regenerations: int = Field(
+        default=1, description="Extra AI calls allowed when vocabulary words repeat"
+    )
+    history_prompt_avoid_limit: int = Field(
+        default=50, description="Most recent vocabulary words listed in a regeneration prompt"
+    )
+    delivery_journal_dir: str = Field(
+        default=".cache/journal",
+        description="Directory of per-date delivery journals used by --resume",
+    )
+    delivery_journal_retention_days: int = Field(
+        default=14, description="Days delivery journals are kept before being pruned"
+    )
     num_words_to_send: int = Field(
         default=5, description="Number of words to send daily"
     )
+    second_language: str = Field(
+        default="Tamil", description="Language of the extra word of the day (empty omits it)"
+    )
+    chat_preferences_path: str = Field(
+        default="",
+        description="JSON file of per-chat language, num_words and difficulty preferences",
+    )
+    ai_max_concurrent_generations: int = Field(
+        default=3, description="Content variants generated concurrently"
+    )
+    run_deadline: str = Field(
+        default="",
+        description="HH:MM[:SS][@Zone] local time a one-shot run must be delivered by (empty disables it)",
+    )
+    run_deadline_seconds: float = Field(
+        default=0.0,
+        description="Seconds from the start of a run or daemon slot to deliver in (0 disables it)",
+    )
+    deadline_budgets_str: str = Field(
+        default="word_selection:0.05;ai:0.6;delivery:0.35",
+        description="';'-separated stage:share split of the run deadline",
+    )
+    deadline_min_ai_seconds: float = Field(
+        default=5.0,
+        description="Smallest AI budget worth trying; with less, unsent fallback content is used if there is any",
+    )
+    delivery_schedule_str: str = Field(
+        default="",
+        description="Daemon delivery slots as ';'-separated HH:MM[@Zone][=chat_id,...] entries",
+    )
+    daemon_default_send_time: str = Field(
+        default="08:00", description="Daemon send time used when no schedule is configured"
+    )
+    daemon_default_timezone: str = Field(
+        default="UTC", description="Time zone for schedule entries without an explicit zone"
+    )
+    interactive_cooldown_seconds: float = Field(
+        default=30.0, description="Minimum time between on-demand commands from one user"
+    )
+    interactive_max_concurrent_updates: int = Field(
+        default=16, description="Telegram updates handled concurrently in interactive mode"
+    )
+    content_pool_path: str = Field(
+        default=".cache/content_pool.json",
+        description="File the pregenerated on-demand content pool is kept in",
+    )
+    content_pool_size: int = Field(
+        default=10, description="Pregenerated content items kept for on-demand requests"
+    )
+    content_pool_low_water: int = Field(
+        default=3, description="Pool size below which it is refilled in the background"
+    )
+    content_pool_max_age_hours: float = Field(
+        default=72.0, description="Age after which pooled content is discarded"
+    )
+    metrics_textfile_path: str = Field(
+        default="",
+        description="Prometheus textfile written after each run (empty disables it)",
+    )
+    metrics_host: str = Field(
+        default="127.0.0.1", description="Address of the daemon's /metrics endpoint"
+    )
+    metrics_port: int = Field(
+        default=0, description="Port of the daemon's /metrics endpoint (0 disables it)"
+    )
     log_level: str = Field(default="INFO", description="Logging level")
+    enable_log_queue: bool = Field(
+        default=True, description="Write log lines from a background thread"
+    )
+    log_sample_rates_str: str = Field(
+        default="", description="';'-separated event=fraction entries: share of each event to log"
+    )
+    log_rate_limits_str: str = Field(
+        default="Message sent successfully=10",
+        description="';'-separated event=N entries: at most N lines per second for each event",
+    )
 
-    @property
+    @cached_property
     def telegram_chat_ids(self) -> list[int]:
         if not self.telegram_chat_ids_str.strip():
             return []
@@ -51,8 +303,15 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
+    """Build the settings on first use and reuse them afterwards."""
     return Settings()
 
 
-settings = get_settings()
+def __getattr__(name: str):
+    # Keep ``from ...settings import settings`` working without building the
+    # settings as a side effect of importing this module.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
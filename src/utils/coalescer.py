@@ -0,0 +1,41 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from .logging import get_logger
+from .metrics import metrics
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class Coalescer:
+    """Shares one in-flight call among every caller that asks for the same key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``factory()`` for ``key``, or join the call already in flight for it.
+
+        The shared call is shielded, so a cancelled caller does not cancel it
+        for the others.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+
+            def forget(done: asyncio.Future) -> None:
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+
+            task.add_done_callback(forget)
+        else:
+            metrics.inc(
+                "coalesced_calls", help="Calls that joined an identical call in flight", coalescer=self.name
+            )
+            logger.debug("Joining in-flight call", coalescer=self.name, key=str(key))
+        return await asyncio.shield(task)
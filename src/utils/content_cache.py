@@ -0,0 +1,132 @@
+import datetime
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Dict, List, Optional
+
+from .files import file_lock, read_json, write_json_atomic
+
+
+@dataclass
+class CachedContent:
+    """Generated daily content stored ahead of its send date."""
+
+    date: str
+    theme_words: List[str]
+    content: str
+    created_at: float
+    expires_at: float
+    variant: str = ""
+
+    @property
+    def key(self) -> str:
+        return ContentCache.make_key(
+            datetime.date.fromisoformat(self.date), self.theme_words, self.variant
+        )
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return self.expires_at <= (now if now is not None else time.time())
+
+
+class ContentCache:
+    """On-disk cache of generated content keyed by date, content variant and theme words."""
+
+    def __init__(self, path: str, ttl_days: int, max_entries: int):
+        self.path = path
+        self.ttl_days = ttl_days
+        self.max_entries = max_entries
+        self.entries: Dict[str, CachedContent] = self._load()
+
+    def reload(self) -> None:
+        """Re-read the cache file, picking up entries written by other processes."""
+        self.entries = self._load()
+
+    @staticmethod
+    def make_key(date: datetime.date, theme_words: List[str], variant: str = "") -> str:
+        return f"{date.isoformat()}:{variant}:{'-'.join(theme_words)}"
+
+    def get(self, date: datetime.date, variant: str = "") -> Optional[CachedContent]:
+        """Return the newest unexpired entry generated for ``date`` and ``variant``, if any."""
+        now = time.time()
+        candidates = [
+            entry for entry in self.entries.values()
+            if entry.date == date.isoformat() and entry.variant == variant and not entry.is_expired(now)
+        ]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda entry: entry.created_at)
+
+    def take_upcoming(self, date: datetime.date, variant: str = "") -> Optional[CachedContent]:
+        """
+        Move the soonest unexpired ``variant`` entry dated after ``date`` to ``date``.
+
+        Content pregenerated for a later day is then sent once, not again on
+        its own day, which generates fresh content instead.
+        """
+        with file_lock(self.path):
+            self.entries = self._load()
+            now = time.time()
+            candidates = [
+                entry for entry in self.entries.values()
+                if entry.date > date.isoformat() and entry.variant == variant and not entry.is_expired(now)
+            ]
+            if not candidates:
+                return None
+            upcoming = min(candidates, key=lambda entry: (entry.date, -entry.created_at))
+            del self.entries[upcoming.key]
+            moved = replace(upcoming, date=date.isoformat())
+            self.entries[moved.key] = moved
+            self.save()
+        return moved
+
+    def put(
+        self, date: datetime.date, theme_words: List[str], content: str, variant: str = ""
+    ) -> CachedContent:
+        """
+        Store content for ``date`` and ``variant`` and persist the cache.
+
+        The file is re-read under a lock first, so entries that other
+        processes wrote since this cache was loaded are kept.
+        """
+        expires_on = date + datetime.timedelta(days=self.ttl_days)
+        entry = CachedContent(
+            date=date.isoformat(),
+            theme_words=list(theme_words),
+            content=content,
+            created_at=time.time(),
+            expires_at=datetime.datetime.combine(expires_on, datetime.time.min).timestamp(),
+            variant=variant,
+        )
+        with file_lock(self.path):
+            self.entries = self._load()
+            self.entries[entry.key] = entry
+            self._evict()
+            self.save()
+        return entry
+
+    def _evict(self) -> None:
+        now = time.time()
+        for key in [key for key, entry in self.entries.items() if entry.is_expired(now)]:
+            del self.entries[key]
+
+        overflow = len(self.entries) - self.max_entries
+        if overflow > 0:
+            oldest = sorted(self.entries.values(), key=lambda entry: entry.created_at)[:overflow]
+            for entry in oldest:
+                del self.entries[entry.key]
+
+    def _load(self) -> Dict[str, CachedContent]:
+        data = read_json(self.path)
+        if not isinstance(data, dict):
+            return {}
+
+        entries = {}
+        for raw in data.get("entries", []):
+            try:
+                entry = CachedContent(**raw)
+            except TypeError:
+                continue
+            entries[entry.key] = entry
+        return entries
+
+    def save(self) -> None:
+        write_json_atomic(self.path, {"entries": [asdict(entry) for entry in self.entries.values()]})
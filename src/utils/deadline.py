@@ -0,0 +1,117 @@
+import datetime
+import time
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ..config.settings import Settings
+from .exceptions import ConfigurationError
+
+# Pipeline stages, in the order they run
+WORD_SELECTION = "word_selection"
+AI_GENERATION = "ai"
+DELIVERY = "delivery"
+
+
+def parse_stage_budgets(spec: str) -> Dict[str, float]:
+    """
+    Parse ``stage:share`` entries separated by ``;`` into fractions of the run.
+
+    Shares are normalised to sum to 1 and keep the order they are given in.
+
+    Raises:
+        ConfigurationError: If an entry is malformed or no share is positive
+    """
+    shares: Dict[str, float] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(";"))):
+        name, _, share = entry.partition(":")
+        try:
+            value = float(share)
+        except ValueError:
+            raise ConfigurationError(f"Invalid deadline budget '{entry}', expected stage:share")
+        if not name.strip() or value < 0:
+            raise ConfigurationError(f"Invalid deadline budget '{entry}', expected stage:share")
+        shares[name.strip()] = value
+
+    total = sum(shares.values())
+    if total <= 0:
+        raise ConfigurationError("Deadline budgets need at least one positive share")
+    return {name: share / total for name, share in shares.items()}
+
+
+class Deadline:
+    """
+    A point in time a run must finish by, split into consecutive stage budgets.
+
+    A stage may run until its cumulative share of the run has elapsed, so
+    time a stage leaves unused carries over to the stages after it.
+    """
+
+    def __init__(
+        self,
+        expires_at: float,
+        budgets: Optional[Dict[str, float]] = None,
+        started_at: Optional[float] = None,
+    ):
+        """
+        Args:
+            expires_at: ``time.monotonic()`` value the run must finish by
+            budgets: Share of the run for each stage, in stage order
+            started_at: ``time.monotonic()`` value the run started at, defaults to now
+        """
+        self.expires_at = expires_at
+        self.budgets = budgets or {}
+        self.started_at = started_at if started_at is not None else time.monotonic()
+
+    @classmethod
+    def within(cls, seconds: float, budgets: Optional[Dict[str, float]] = None) -> "Deadline":
+        now = time.monotonic()
+        return cls(now + seconds, budgets, now)
+
+    @classmethod
+    def from_settings(
+        cls, settings: Settings, now: Optional[datetime.datetime] = None
+    ) -> Optional["Deadline"]:
+        """
+        The deadline for a run starting ``now``, or None if no deadline is configured.
+
+        ``RUN_DEADLINE`` (a local clock time) takes precedence over
+        ``RUN_DEADLINE_SECONDS`` (a budget from the start of the run).
+
+        Raises:
+            ConfigurationError: If the deadline or budgets are invalid
+        """
+        budgets = parse_stage_budgets(settings.deadline_budgets_str)
+        spec = settings.run_deadline.strip()
+        if not spec:
+            if settings.run_deadline_seconds <= 0:
+                return None
+            return cls.within(settings.run_deadline_seconds, budgets)
+
+        time_str, _, zone = spec.partition("@")
+        try:
+            tzinfo = ZoneInfo(zone.strip() or settings.daemon_default_timezone)
+            clock = datetime.time.fromisoformat(time_str.strip())
+        except (ValueError, ZoneInfoNotFoundError) as e:
+            raise ConfigurationError(f"Invalid run deadline '{spec}': {e}")
+
+        now = (now or datetime.datetime.now(datetime.timezone.utc)).astimezone(tzinfo)
+        due = datetime.datetime.combine(now.date(), clock, tzinfo=tzinfo)
+        return cls.within((due - now).total_seconds(), budgets)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def stage(self, name: str) -> "Deadline":
+        """The deadline for stage ``name``; unknown stages get the whole run."""
+        if name not in self.budgets:
+            return self
+        share = 0.0
+        for stage, stage_share in self.budgets.items():
+            share += stage_share
+            if stage == name:
+                break
+        ends_at = self.started_at + (self.expires_at - self.started_at) * share
+        return Deadline(min(ends_at, self.expires_at), started_at=self.started_at)
@@ -10,9 +10,29 @@ class AIServiceError(RandomWordBotError):
     """Raised when AI service encounters an error."""
 
 
+class EmptyResponseError(AIServiceError):
+    """Raised when a model returns an empty completion."""
+
+
+class InvalidResponseError(AIServiceError):
+    """Raised when a structured-mode response does not match the content schema."""
+
+
+class TruncatedResponseError(InvalidResponseError):
+    """Raised when a response is cut off by the output token cap."""
+
+
+class StreamTimeoutError(AIServiceError):
+    """Raised when a streamed completion misses its first-token or stall deadline."""
+
+
 class TelegramBotError(RandomWordBotError):
     """Raised when Telegram bot encounters an error."""
 
 
 class WordSelectionError(RandomWordBotError):
-    """Raised when word selection fails."""
\ No newline at end of file
+    """Raised when word selection fails."""
+
+
+class DeadlineExceededError(RandomWordBotError):
+    """Raised when a stage runs out of its share of the run deadline."""
@@ -0,0 +1,76 @@
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from .logging import get_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = get_logger(__name__)
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock shared by every process using ``path``.
+
+    The lock is taken on a ``.lock`` file next to ``path``, so that ``path``
+    itself can be replaced while the lock is held. Without fcntl the block
+    runs unlocked.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def read_json(path: str) -> Optional[Any]:
+    """Load a JSON file, or return None if it is missing or unreadable (which is logged)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable file", path=path, error=str(e))
+        return None
+
+
+def write_text_atomic(path: str, text: str) -> None:
+    """
+    Replace ``path`` with ``text`` so that readers see the old or the new
+    contents, never a partial write.
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """
+    Atomically replace ``path`` with ``data`` serialised as JSON.
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    write_text_atomic(path, json.dumps(data))
@@ -0,0 +1,139 @@
+import datetime
+import os
+import re
+import sqlite3
+from typing import Dict, Iterable, List, Set
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+THEME = "theme"
+VOCABULARY = "vocabulary"
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_SINGLE_WORD = re.compile(r"^[A-Za-z][A-Za-z'-]*$")
+# Bold labels the model uses for structure rather than for vocabulary words
+_LABELS = {
+    "definition", "example", "examples", "meaning", "pronunciation", "part",
+    "speech", "theme", "today", "tamil", "numerology", "significance", "note",
+}
+
+
+def extract_vocabulary_words(text: str) -> List[str]:
+    """
+    Pull the vocabulary words out of a free-text AI response.
+
+    The prompt asks for each word in bold, so single-word bold spans that are
+    not structural labels are taken as the day's vocabulary.
+    """
+    words: List[str] = []
+    for match in _BOLD.finditer(text):
+        candidate = match.group(1).strip().rstrip(".,;")
+        if candidate.endswith(":"):
+            continue
+        candidate = re.sub(r"\s*\(.*\)$", "", candidate).strip()
+        if _SINGLE_WORD.match(candidate) and candidate.lower() not in _LABELS:
+            word = candidate.lower()
+            if word not in words:
+                words.append(word)
+    return words
+
+
+class WordHistory:
+    """
+    SQLite-backed record of words used on previous days.
+
+    Words used within the configured window are also kept in in-memory sets,
+    so membership checks stay constant-time however long the history grows.
+    The sets are rebuilt when the day changes, so that words age out of the
+    window in long-running processes too.
+    """
+
+    def __init__(self, path: str, window_days: int):
+        self.path = path
+        self.window_days = window_days
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS word_history (
+                word TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                used_on TEXT NOT NULL,
+                PRIMARY KEY (kind, word, used_on)
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS word_history_recent ON word_history (kind, used_on)"
+        )
+        self._connection.commit()
+        self._recent: Dict[str, Set[str]] = {}
+        self._loaded_on = datetime.date.min
+        self._load_recent()
+
+    def _window_start(self) -> str:
+        return (datetime.date.today() - datetime.timedelta(days=self.window_days)).isoformat()
+
+    def _load_recent(self) -> None:
+        self._loaded_on = datetime.date.today()
+        self._recent = {THEME: set(), VOCABULARY: set()}
+        rows = self._connection.execute(
+            "SELECT kind, word FROM word_history WHERE used_on >= ?",
+            (self._window_start(),),
+        )
+        for kind, word in rows:
+            self._recent.setdefault(kind, set()).add(word)
+        logger.debug(
+            "Loaded word history",
+            **{kind: len(words) for kind, words in self._recent.items()},
+        )
+
+    def _recent_words(self, kind: str) -> Set[str]:
+        if self._loaded_on != datetime.date.today():
+            self._load_recent()
+        return self._recent.get(kind, set())
+
+    def contains(self, word: str, kind: str) -> bool:
+        return word.lower() in self._recent_words(kind)
+
+    def recent(self, kind: str) -> Set[str]:
+        """Words of ``kind`` used within the window."""
+        return self._recent_words(kind)
+
+    def find_repeats(self, words: Iterable[str], kind: str) -> List[str]:
+        return [word for word in words if self.contains(word, kind)]
+
+    def latest(self, kind: str, limit: int) -> List[str]:
+        """The ``limit`` most recently used words of ``kind``."""
+        rows = self._connection.execute(
+            """
+            SELECT word FROM word_history
+            WHERE kind = ? AND used_on >= ?
+            GROUP BY word
+            ORDER BY MAX(used_on) DESC
+            LIMIT ?
+            """,
+            (kind, self._window_start(), limit),
+        )
+        return [word for (word,) in rows]
+
+    def record(self, words: Iterable[str], kind: str, used_on: datetime.date) -> None:
+        normalized = [word.lower() for word in words]
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO word_history (word, kind, used_on) VALUES (?, ?, ?)",
+                [(word, kind, used_on.isoformat()) for word in normalized],
+            )
+        if self._loaded_on == datetime.date.today():
+            self._recent.setdefault(kind, set()).update(normalized)
+        else:
+            self._load_recent()
+
+    def close(self) -> None:
+        self._connection.close()
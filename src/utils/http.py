@@ -0,0 +1,262 @@
+import asyncio
+import socket
+import time
+from contextlib import contextmanager
+from typing import AsyncIterable, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+from ..config.settings import Settings, get_settings
+from .logging import get_logger
+from .metrics import metrics
+
+logger = get_logger(__name__)
+
+_transport: Optional["SharedTransport"] = None
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that caches DNS lookups for ``ttl`` seconds.
+
+    The system resolver gives no TTLs, so a fixed one is used. Connections
+    are made to the resolved address; TLS still verifies the original host
+    name, which httpcore passes to the handshake separately.
+    """
+
+    def __init__(self, ttl: float, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.ttl = ttl
+        self.backend = backend or httpcore.AnyIOBackend()
+        self._addresses: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+    async def _resolve(self, host: str, port: int, timeout: Optional[float]) -> List[str]:
+        key = (host, port)
+        cached = self._addresses.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            metrics.inc("dns_cache_lookups", help="Host name lookups", result="hit")
+            return cached[1]
+
+        metrics.inc("dns_cache_lookups", help="Host name lookups", result="miss")
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout
+            )
+        except asyncio.TimeoutError:
+            raise httpcore.ConnectTimeout(f"Timed out resolving {host}")
+        except OSError as e:
+            raise httpcore.ConnectError(f"Cannot resolve {host}: {e}")
+
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._addresses[key] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options=None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            socket.inet_pton(socket.AF_INET6 if ":" in host else socket.AF_INET, host)
+            addresses = [host]
+        except OSError:
+            addresses = await self._resolve(host, port, timeout)
+
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                stream = await self.backend.connect_tcp(
+                    address, port, timeout, local_address, socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+                continue
+            metrics.inc("http_connections_opened", help="New TCP connections", host=host)
+            return stream
+
+        # Every cached address failed; resolve again next time
+        self._addresses.pop((host, port), None)
+        raise error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+# httpcore exceptions and their httpx counterparts, most specific first
+_EXCEPTIONS = tuple(
+    (getattr(httpcore, name), getattr(httpx, name))
+    for name in (
+        "ConnectTimeout",
+        "ReadTimeout",
+        "WriteTimeout",
+        "PoolTimeout",
+        "TimeoutException",
+        "ConnectError",
+        "ReadError",
+        "WriteError",
+        "NetworkError",
+        "ProxyError",
+        "UnsupportedProtocol",
+        "LocalProtocolError",
+        "RemoteProtocolError",
+        "ProtocolError",
+    )
+)
+
+
+@contextmanager
+def _httpx_errors() -> Iterator[None]:
+    """Re-raise httpcore errors as the httpx errors clients expect."""
+    try:
+        yield
+    except Exception as e:
+        for source, target in _EXCEPTIONS:
+            if isinstance(e, source):
+                raise target(str(e)) from e
+        raise
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream: AsyncIterable[bytes]):
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _httpx_errors():
+            async for part in self._stream:
+                yield part
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            with _httpx_errors():
+                await self._stream.aclose()
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """
+    One pooled HTTP transport for every client in the process.
+
+    It drives an httpcore connection pool directly, since that is where a
+    caching network backend can be plugged in. Clients built on it may
+    close themselves freely: only ``shutdown`` releases the connection pool.
+    """
+
+    def __init__(self, settings: Settings):
+        http2 = settings.enable_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 needs the h2 package (pip install 'httpx[http2]'), using HTTP/1.1")
+                http2 = False
+
+        self.total_timeout = settings.http_total_timeout_seconds
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+            http2=http2,
+            network_backend=(
+                CachingNetworkBackend(settings.dns_cache_ttl_seconds)
+                if settings.dns_cache_ttl_seconds > 0
+                else None
+            ),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            with _httpx_errors():
+                response = await asyncio.wait_for(
+                    self._pool.handle_async_request(core_request), self.total_timeout
+                )
+        except asyncio.TimeoutError:
+            raise httpx.TimeoutException(
+                f"No response within {self.total_timeout:.0f}s", request=request
+            )
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        # Called by every client sharing the transport when it is closed
+        pass
+
+    async def shutdown(self) -> None:
+        await self._pool.aclose()
+
+
+def get_http_transport() -> SharedTransport:
+    """Return the process-wide HTTP transport, creating it on first use."""
+    global _transport
+    if _transport is None:
+        _transport = SharedTransport(get_settings())
+    return _transport
+
+
+def openai_http_client() -> Optional[httpx.AsyncClient]:
+    """
+    HTTP client for ``AsyncOpenAI`` on the process-wide transport.
+
+    Returns None when the installed openai package is built on a different
+    HTTP library than httpx, in which case it keeps its own connection pool.
+    """
+    from openai import DefaultAsyncHttpxClient
+
+    if not issubclass(DefaultAsyncHttpxClient, httpx.AsyncClient):
+        logger.warning("openai does not use httpx, its connections are not shared")
+        return None
+    return DefaultAsyncHttpxClient(transport=get_http_transport())
+
+
+async def close_http_transport() -> None:
+    """Release the process-wide connection pool, if one was created."""
+    global _transport
+    if _transport is not None:
+        await _transport.shutdown()
+        _transport = None
+
+
+async def warm_up(urls: List[str]) -> None:
+    """
+    Open pooled connections to ``urls`` ahead of time.
+
+    DNS lookups and TLS handshakes then happen here rather than on the first
+    real request. Failures are logged and otherwise ignored.
+    """
+    settings = get_settings()
+    async with httpx.AsyncClient(
+        transport=get_http_transport(),
+        timeout=httpx.Timeout(settings.http_read_timeout_seconds, connect=settings.http_connect_timeout_seconds),
+    ) as client:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(client.head(url) for url in urls), return_exceptions=True)
+
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.warning("Connection warm-up failed", url=url, error=str(result))
+    metrics.observe(
+        "http_warm_up_seconds", time.perf_counter() - started, help="Time to pre-open HTTP connections"
+    )
+    logger.info("Warmed up HTTP connections", hosts=len(urls))
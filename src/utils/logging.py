@@ -1,22 +1,272 @@
-import structlog
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
 import sys
-from typing import Any
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
+from .exceptions import ConfigurationError
 
-def configure_logging(log_level: str = "INFO") -> None:
-    """Configure structured logging for the application."""
-    
-    structlog.configure(
+if TYPE_CHECKING:
+    import structlog
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Libraries that log every request at INFO. Telegram request URLs contain the
+# bot token, so these never log below WARNING whatever LOG_LEVEL is.
+_QUIET_LOGGERS = ("httpx", "httpcore", "hpack", "h2", "openai", "telegram")
+
+
+@dataclass
+class LoggingStats:
+    """What logging cost the process so far."""
+
+    events: int = 0
+    dropped: int = 0
+    # Time spent in the caller: processing, rendering and handing the line
+    # to the handler (the write itself, unless a background thread does it)
+    overhead_seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        summary = asdict(self)
+        summary["overhead_seconds"] = round(self.overhead_seconds, 6)
+        return summary
+
+
+logging_stats = LoggingStats()
+
+
+class _LazyLogger:
+    """Logger handle that defers importing structlog until it is first used."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._logger: Optional[Any] = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._logger is None:
+            import structlog
+
+            self._logger = structlog.get_logger(self._name)
+        return getattr(self._logger, attr)
+
+
+def parse_event_limits(spec: str) -> Dict[str, float]:
+    """
+    Parse ``event=value`` entries separated by ``;``.
+
+    Raises:
+        ConfigurationError: If an entry is malformed
+    """
+    limits: Dict[str, float] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(";"))):
+        event, _, value = entry.rpartition("=")
+        try:
+            limits[event.strip()] = float(value)
+        except ValueError:
+            event = ""
+        if not event.strip():
+            raise ConfigurationError(f"Invalid log event limit '{entry}', expected event=value")
+    return limits
+
+
+class _EventThrottle:
+    """
+    Samples and rate-limits chosen events.
+
+    Used as a structlog processor for the application's events and as a
+    handler filter for records logged by other libraries. Only events below
+    WARNING are ever dropped.
+    """
+
+    def __init__(self, sample_rates: Dict[str, float], rate_limits: Dict[str, float]):
+        self.sample_rates = sample_rates
+        self.rate_limits = rate_limits
+        self._windows: Dict[str, Tuple[int, int]] = {}
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> dict:
+        import structlog
+
+        if not self.allow(event_dict.get("event"), method_name):
+            raise structlog.DropEvent
+        return event_dict
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Events from structlog loggers went through __call__ already
+        if hasattr(record, "_logger"):
+            return True
+        return self.allow(record.getMessage(), record.levelname.lower())
+
+    def allow(self, event: Any, method_name: str) -> bool:
+        if method_name in ("warning", "error", "critical", "exception"):
+            return True
+
+        rate = self.sample_rates.get(event)
+        if rate is not None and random.random() >= rate:
+            logging_stats.dropped += 1
+            return False
+
+        limit = self.rate_limits.get(event)
+        if limit is not None:
+            second = int(time.monotonic())
+            window, count = self._windows.get(event, (second, 0))
+            if window != second:
+                window, count = second, 0
+            if count >= limit:
+                logging_stats.dropped += 1
+                return False
+            self._windows[event] = (window, count + 1)
+        return True
+
+
+def _start_timer(logger, method_name: str, event_dict: dict) -> dict:
+    event_dict["_log_started"] = time.perf_counter()
+    return event_dict
+
+
+def _stop_timer(logger, method_name: str, event_dict: dict) -> dict:
+    # Rendering and writing happen in the handler, which times itself
+    started = event_dict.pop("_log_started", None)
+    if started is not None:
+        logging_stats.overhead_seconds += time.perf_counter() - started
+    return event_dict
+
+
+class _CountingRenderer:
+    """Wraps the final renderer to count the lines it renders."""
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> str:
+        rendered = self.renderer(logger, method_name, event_dict)
+        logging_stats.events += 1
+        return rendered
+
+
+class _TimedHandlerMixin:
+    def emit(self, record: logging.LogRecord) -> None:
+        started = time.perf_counter()
+        super().emit(record)
+        logging_stats.overhead_seconds += time.perf_counter() - started
+
+
+class _TimedStreamHandler(_TimedHandlerMixin, logging.StreamHandler):
+    pass
+
+
+class _TimedQueueHandler(_TimedHandlerMixin, logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render in the caller so the listener only writes lines; the record
+        # is not shared with other handlers, so it needs no copy
+        record.msg = self.format(record)
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
+
+
+def _json_serializer():
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    def dumps(obj: Any, **kwargs) -> str:
+        return orjson.dumps(obj, default=kwargs.get("default")).decode("utf-8")
+
+    return dumps
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Flushes queued lines on exit
+atexit.register(_stop_listener)
+
+
+def configure_logging(
+    log_level: str = "INFO",
+    use_queue: bool = False,
+    sample_rates: Optional[Dict[str, float]] = None,
+    rate_limits: Optional[Dict[str, float]] = None,
+) -> None:
+    """
+    Configure structured logging for the application.
+
+    Args:
+        log_level: Minimum level to log
+        use_queue: Write log lines from a background thread instead of the caller
+        sample_rates: Fraction of each named event to keep
+        rate_limits: Maximum lines per second for each named event
+    """
+    global _listener
+    import structlog
+
+    _stop_listener()
+    serializer = _json_serializer()
+    renderer = (
+        structlog.processors.JSONRenderer(serializer=serializer)
+        if serializer is not None
+        else structlog.processors.JSONRenderer()
+    )
+    shared_processors = [
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+        structlog.processors.UnicodeDecoder(),
+    ]
+    # Records from other libraries are rendered as the same JSON lines
+    formatter = structlog.stdlib.ProcessorFormatter(
         processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            _CountingRenderer(renderer),
+        ],
+        foreign_pre_chain=shared_processors,
+    )
+
+    # The write is only caller overhead when it happens in the caller
+    output = (logging.StreamHandler if use_queue else _TimedStreamHandler)(sys.stdout)
+    if use_queue:
+        output.setFormatter(logging.Formatter("%(message)s"))
+        # Unbounded so that logging never blocks the event loop
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        handler: logging.Handler = _TimedQueueHandler(records)
+        _listener = logging.handlers.QueueListener(records, output)
+        _listener.start()
+    else:
+        handler = output
+    handler.setFormatter(formatter)
+
+    throttle = _EventThrottle(sample_rates or {}, rate_limits or {}) if sample_rates or rate_limits else None
+    if throttle is not None:
+        handler.addFilter(throttle)
+
+    # Without a handler and level on the root logger, filter_by_level drops
+    # everything below WARNING regardless of ``log_level``
+    logging.basicConfig(level=log_level.upper(), handlers=[handler], force=True)
+    quiet_level = max(logging.WARNING, logging.getLogger().getEffectiveLevel())
+    for name in _QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(quiet_level)
+
+    processors = [structlog.stdlib.filter_by_level, _start_timer]
+    if throttle is not None:
+        processors.append(throttle)
+    structlog.configure(
+        processors=processors + shared_processors + [
+            _stop_timer,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -25,6 +275,6 @@ def configure_logging(log_level: str = "INFO") -> None:
     )
 
 
-def get_logger(name: str) -> structlog.stdlib.BoundLogger:
+def get_logger(name: str) -> "structlog.stdlib.BoundLogger":
     """Get a structured logger instance."""
-    return structlog.get_logger(name)
\ No newline at end of file
+    return _LazyLogger(name)
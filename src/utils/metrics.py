@@ -0,0 +1,180 @@
+import asyncio
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .files import write_text_atomic
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Histogram buckets in seconds, from a single Telegram send up to a slow model
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0,
+)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+def _label_set(labels: Dict[str, object]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelSet, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and histograms rendered in Prometheus text format."""
+
+    def __init__(self, namespace: str = "randomwordbot"):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._help: Dict[str, str] = {}
+        self._counters: Dict[str, Dict[LabelSet, float]] = {}
+        self._gauges: Dict[str, Dict[LabelSet, float]] = {}
+        self._histograms: Dict[str, Dict[LabelSet, _Histogram]] = {}
+
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}"
+
+    def inc(self, name: str, amount: float = 1.0, help: str = "", **labels) -> None:
+        """Increment the counter ``<namespace>_<name>_total``."""
+        full_name = self._name(f"{name}_total")
+        with self._lock:
+            self._help.setdefault(full_name, help)
+            series = self._counters.setdefault(full_name, {})
+            key = _label_set(labels)
+            series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, help: str = "", **labels) -> None:
+        """Set the gauge ``<namespace>_<name>``."""
+        full_name = self._name(name)
+        with self._lock:
+            self._help.setdefault(full_name, help)
+            self._gauges.setdefault(full_name, {})[_label_set(labels)] = value
+
+    def observe(self, name: str, value: float, help: str = "", **labels) -> None:
+        """Record ``value`` in the histogram ``<namespace>_<name>``."""
+        full_name = self._name(name)
+        with self._lock:
+            self._help.setdefault(full_name, help)
+            series = self._histograms.setdefault(full_name, {})
+            key = _label_set(labels)
+            if key not in series:
+                series[key] = _Histogram(DEFAULT_BUCKETS)
+            series[key].observe(value)
+
+    @contextmanager
+    def span(self, stage: str, **labels) -> Iterator[None]:
+        """Time a pipeline stage into the stage duration histogram."""
+        started = time.perf_counter()
+        outcome = "success"
+        try:
+            yield
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            self.observe(
+                "stage_duration_seconds",
+                time.perf_counter() - started,
+                help="Duration of pipeline stages",
+                stage=stage,
+                outcome=outcome,
+                **labels,
+            )
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for kind, families in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted(families):
+                    lines.append(f"# HELP {name} {self._help.get(name) or name}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for labels, value in sorted(families[name].items()):
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            for name in sorted(self._histograms):
+                lines.append(f"# HELP {name} {self._help.get(name) or name}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        le = _format_labels(labels, ("le", _format_value(bound)))
+                        lines.append(f"{name}_bucket{le} {cumulative}")
+                    le = _format_labels(labels, ("le", "+Inf"))
+                    lines.append(f"{name}_bucket{le} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically write the metrics for the node_exporter textfile collector."""
+        try:
+            write_text_atomic(path, self.render())
+        except OSError as e:
+            logger.warning("Failed to write metrics file", path=path, error=str(e))
+
+    async def serve(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Serve the metrics over HTTP for scraping in long-running mode."""
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                request_line = await reader.readline()
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                parts = request_line.decode("latin-1").split()
+                if len(parts) >= 2 and parts[1].split("?")[0] == "/metrics":
+                    status, body = "200 OK", self.render().encode()
+                else:
+                    status, body = "404 Not Found", b"Not Found\n"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Connection: close\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(handle, host, port)
+        logger.info("Serving metrics", host=host, port=port)
+        return server
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import Dict, Hashable, Optional
+
+
+class TokenBucket:
+    """Async token bucket limiting how often an operation may run."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size, defaults to one second worth of tokens
+        """
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` are available and consume them."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def is_idle(self) -> bool:
+        """Whether the bucket is full and unused, so a new one would behave the same."""
+        self._refill()
+        return self._tokens >= self.capacity and not self._lock.locked()
+
+    def pause(self, seconds: float) -> None:
+        """Drain the bucket so that no tokens are available for ``seconds``."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+class KeyedTokenBuckets:
+    """Lazily created token buckets, one per key."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+
+    def get(self, key: Hashable) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.capacity)
+            self._buckets[key] = bucket
+        return bucket
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def prune(self) -> int:
+        """Drop idle buckets, returning how many were dropped; they are recreated on demand."""
+        idle = [key for key, bucket in self._buckets.items() if bucket.is_idle()]
+        for key in idle:
+            del self._buckets[key]
+        return len(idle)
@@ -0,0 +1,104 @@
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional
+
+# This module is imported before anything else when profiling, so it must only
+# depend on the standard library.
+
+
+class _TimedLoader:
+    """Loader proxy that records how long ``exec_module`` takes."""
+
+    def __init__(self, loader, name: str, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def __getattr__(self, attr: str):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        self._profiler._enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name)
+
+
+class _TimingFinder(MetaPathFinder):
+    """Meta path finder that wraps the loaders found by the other finders."""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, fullname, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """Records per-module import time and the time to the first network call."""
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.first_network_at: Optional[float] = None
+        self.first_network_event: Optional[str] = None
+        self.cumulative: Dict[str, float] = {}
+        self.self_time: Dict[str, float] = {}
+        self._stack: List[List] = []
+
+    def install(self) -> "StartupProfiler":
+        sys.meta_path.insert(0, _TimingFinder(self))
+        # Audit hooks cannot be removed, so only install them when profiling
+        sys.addaudithook(self._audit)
+        return self
+
+    def _audit(self, event: str, args) -> None:
+        if self.first_network_at is None and event in ("socket.getaddrinfo", "socket.connect"):
+            self.first_network_at = time.perf_counter()
+            self.first_network_event = event
+
+    def _enter(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name: str) -> None:
+        _, started, children = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.cumulative[name] = elapsed
+        self.self_time[name] = elapsed - children
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def report(self, top: int = 15) -> dict:
+        """Summarize the slowest imports and the time to the first network call."""
+        slowest = sorted(self.cumulative.items(), key=lambda item: item[1], reverse=True)[:top]
+        return {
+            "elapsed_ms": round((time.perf_counter() - self.started_at) * 1000, 1),
+            "import_total_ms": round(sum(self.self_time.values()) * 1000, 1),
+            "modules_imported": len(self.cumulative),
+            "first_network_call_ms": (
+                round((self.first_network_at - self.started_at) * 1000, 1)
+                if self.first_network_at is not None
+                else None
+            ),
+            "first_network_event": self.first_network_event,
+            "slowest_imports_ms": {
+                name: {
+                    "cumulative": round(cumulative * 1000, 1),
+                    "self": round(self.self_time[name] * 1000, 1),
+                }
+                for name, cumulative in slowest
+            },
+        }
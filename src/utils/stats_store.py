@@ -0,0 +1,55 @@
+from dataclasses import asdict, fields
+from typing import Any, Dict, Generic, Type, TypeVar
+
+from .files import read_json, write_json_atomic
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+S = TypeVar("S")
+
+
+def from_known_fields(cls: Type[S], data: Dict[str, Any]) -> S:
+    """Build dataclass ``cls`` from ``data``, ignoring keys it has no field for."""
+    known = {f.name for f in fields(cls)}
+    return cls(**{key: value for key, value in data.items() if key in known})
+
+
+class StatsStore(Generic[S]):
+    """
+    Named statistics dataclasses persisted to a small JSON file between runs.
+
+    Subclasses set ``record_class`` and the ``section`` of the file the
+    records are kept under.
+    """
+
+    record_class: Type[S]
+    section: str
+
+    def __init__(self, path: str):
+        self.path = path
+        self.stats: Dict[str, S] = self._load()
+
+    def get(self, key: str) -> S:
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.record_class()
+            self.stats[key] = stats
+        return stats
+
+    def _load(self) -> Dict[str, S]:
+        data = read_json(self.path)
+        if not isinstance(data, dict):
+            return {}
+        return {
+            key: from_known_fields(self.record_class, entry)
+            for key, entry in data.get(self.section, {}).items()
+        }
+
+    def save(self) -> None:
+        try:
+            write_json_atomic(
+                self.path, {self.section: {key: asdict(stats) for key, stats in self.stats.items()}}
+            )
+        except OSError as e:
+            logger.warning("Failed to save stats", path=self.path, error=str(e))
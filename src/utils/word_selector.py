@@ -1,55 +1,313 @@
+import asyncio
+import mmap
 import os
 import random
-from typing import List
+import struct
+import threading
+from array import array
+from typing import AbstractSet, Callable, Dict, Iterator, List, Optional
 
 from ..utils.exceptions import WordSelectionError
+from ..utils.logging import get_logger
+from .word_weights import DifficultyBand, WeightedWordTable
+
+logger = get_logger(__name__)
+
+
+# Index file layout: fixed header followed by an array of line offsets.
+# The offset array uses 32-bit entries when the dictionary fits in 4 GiB.
+_INDEX_MAGIC = b"RWBIDX01"
+_INDEX_HEADER = struct.Struct("<8s1s7xQQQ")
+_MIN_WORD_LENGTH = 3
+_MAX_WORD_LENGTH = 20
+# Sampling rounds before giving up on finding enough words outside ``exclude``
+_MAX_SAMPLING_ROUNDS = 8
+# Weighted draws allowed per wanted word before a round gives up on new positions
+_MAX_DRAWS_PER_WORD = 16
+
+
+def _normalize_word(raw: bytes) -> Optional[str]:
+    """Decode a dictionary line and return the word if it passes the filter."""
+    word = raw.decode("utf-8", errors="ignore").strip().lower()
+
+    # Filter: alphabetic only, reasonable length
+    if not word.isalpha() or len(word) < _MIN_WORD_LENGTH or len(word) > _MAX_WORD_LENGTH:
+        return None
+    return word
+
+
+class WordIndex:
+    """Memory-mapped offset index over the usable lines of a dictionary file."""
+
+    def __init__(self, words_file_path: str, index_path: str):
+        self.words_file_path = words_file_path
+        self.index_path = index_path
+        self._source_stat: Optional[os.stat_result] = None
+        self._index_file = None
+        self._index_map: Optional[mmap.mmap] = None
+        self._offsets: Optional[memoryview] = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) if self._offsets is not None else 0
+
+    @property
+    def source_stat(self) -> Optional[os.stat_result]:
+        """Stat of the dictionary file the loaded index was built from."""
+        return self._source_stat
+
+    def offset(self, position: int) -> int:
+        """Return the byte offset of the indexed word at ``position``."""
+        return self._offsets[position]
+
+    def load(self) -> None:
+        """Map the index, rebuilding it first if the dictionary has changed."""
+        source_stat = os.stat(self.words_file_path)
+        if self._offsets is not None and self._matches(source_stat, self._source_stat):
+            return
+
+        self.close()
+        if not self._read_header_matches(source_stat):
+            self._build(source_stat)
+        self._map(source_stat)
+
+    def close(self) -> None:
+        """Release the memory map and file handle, if any."""
+        if self._offsets is not None:
+            self._offsets.release()
+            self._offsets = None
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+        self._source_stat = None
+
+    @staticmethod
+    def _matches(source_stat: os.stat_result, other: Optional[os.stat_result]) -> bool:
+        return (
+            other is not None
+            and source_stat.st_mtime_ns == other.st_mtime_ns
+            and source_stat.st_size == other.st_size
+        )
+
+    def _read_header_matches(self, source_stat: os.stat_result) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+        except OSError:
+            return False
+
+        if len(header) != _INDEX_HEADER.size:
+            return False
+
+        magic, _, mtime_ns, size, _ = _INDEX_HEADER.unpack(header)
+        return (
+            magic == _INDEX_MAGIC
+            and mtime_ns == source_stat.st_mtime_ns
+            and size == source_stat.st_size
+        )
+
+    def _build(self, source_stat: os.stat_result) -> None:
+        typecode = "I" if source_stat.st_size < 2**32 else "Q"
+        offsets = array(typecode)
+
+        with open(self.words_file_path, "rb") as f:
+            position = 0
+            for line in f:
+                if _normalize_word(line) is not None:
+                    offsets.append(position)
+                position += len(line)
+
+        index_dir = os.path.dirname(self.index_path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(
+                _INDEX_HEADER.pack(
+                    _INDEX_MAGIC,
+                    typecode.encode("ascii"),
+                    source_stat.st_mtime_ns,
+                    source_stat.st_size,
+                    len(offsets),
+                )
+            )
+            offsets.tofile(f)
+        os.replace(tmp_path, self.index_path)
+
+    def _map(self, source_stat: os.stat_result) -> None:
+        self._index_file = open(self.index_path, "rb")
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, typecode, _, _, count = _INDEX_HEADER.unpack_from(self._index_map)
+        typecode = typecode.decode("ascii")
+        end = _INDEX_HEADER.size + count * array(typecode).itemsize
+        if len(self._index_map) < end:
+            self.close()
+            raise WordSelectionError(f"Word index at {self.index_path} is truncated")
+
+        self._offsets = memoryview(self._index_map)[_INDEX_HEADER.size:end].cast(typecode)
+        self._source_stat = source_stat
 
 
 class WordSelector:
     """Handles selection of random words from dictionary file."""
-    
-    def __init__(self, words_file_path: str):
+
+    def __init__(
+        self,
+        words_file_path: str,
+        index_path: Optional[str] = None,
+        frequency_path: Optional[str] = None,
+        difficulty_bands: Optional[Dict[str, DifficultyBand]] = None,
+        default_difficulty: Optional[str] = None,
+        frequency_exponent: float = 0.0,
+    ):
         self.words_file_path = words_file_path
-    
-    async def get_random_words(self, num_words: int) -> List[str]:
+        self.index = WordIndex(words_file_path, index_path or f"{words_file_path}.idx")
+        self.frequency_path = frequency_path or None
+        self.difficulty_bands = difficulty_bands or {}
+        self.default_difficulty = default_difficulty or None
+        self.frequency_exponent = frequency_exponent
+        self._tables: Dict[str, WeightedWordTable] = {}
+        self._index_lock = threading.Lock()
+
+    async def get_random_words(
+        self,
+        num_words: int,
+        exclude: Optional[AbstractSet[str]] = None,
+        difficulty: Optional[str] = None,
+    ) -> List[str]:
         """
-        Get random words from file using reservoir sampling.
-        
+        Get random words from the dictionary using its offset index.
+
+        With a frequency list configured, words are drawn from the requested
+        difficulty band in proportion to their weight; otherwise uniformly.
+
         Args:
             num_words: Number of words to select
-            
+            exclude: Words to skip, such as recently used theme words
+            difficulty: Difficulty band name, defaults to WORD_DIFFICULTY
+
         Returns:
             List of randomly selected words
-            
+
         Raises:
-            WordSelectionError: If file reading fails
+            WordSelectionError: If file reading fails or the band is unknown
         """
         if not os.path.exists(self.words_file_path):
             raise WordSelectionError(f"Dictionary file not found at {self.words_file_path}")
 
-        selected_words = []
-        word_count = 0
-        
         try:
-            with open(self.words_file_path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    word = line.strip().lower()
-                    
-                    # Filter: alphabetic only, reasonable length
-                    if not word.isalpha() or len(word) < 3 or len(word) > 20:
-                        continue
-
-                    word_count += 1
-
-                    if len(selected_words) < num_words:
-                        selected_words.append(word)
-                    else:
-                        # Reservoir sampling
-                        j = random.randrange(word_count)
-                        if j < num_words:
-                            selected_words[j] = word
-                            
+            return await asyncio.to_thread(
+                self._sample_words, num_words, exclude or frozenset(), difficulty
+            )
+        except WordSelectionError:
+            raise
         except Exception as e:
             raise WordSelectionError(f"Error reading dictionary file: {e}")
-            
-        return selected_words
\ No newline at end of file
+
+    def _weighted_table(self, difficulty: Optional[str]) -> Optional[WeightedWordTable]:
+        """Return the loaded alias table for ``difficulty``, or None to sample uniformly."""
+        difficulty = difficulty or self.default_difficulty
+        if not self.frequency_path or not difficulty:
+            return None
+
+        band = self.difficulty_bands.get(difficulty)
+        if band is None:
+            raise WordSelectionError(f"Unknown word difficulty '{difficulty}'")
+
+        table = self._tables.get(band.name)
+        if table is None:
+            table = WeightedWordTable(
+                f"{self.index.index_path}.{band.name}.alias",
+                band,
+                self.frequency_path,
+                self.frequency_exponent,
+            )
+            self._tables[band.name] = table
+
+        try:
+            table.load(self.index.source_stat, self._iter_index_words)
+        except OSError as e:
+            logger.warning("Word frequency list unavailable, sampling uniformly", error=str(e))
+            return None
+        if not len(table):
+            logger.warning("No dictionary words in difficulty band, sampling uniformly", band=band.name)
+            return None
+        return table
+
+    def _iter_index_words(self) -> Iterator[str]:
+        """Yield the indexed words in index order, using the index's own filter."""
+        with open(self.words_file_path, "rb") as f:
+            for line in f:
+                word = _normalize_word(line)
+                if word is not None:
+                    yield word
+
+    def _sample_words(
+        self, num_words: int, exclude: AbstractSet[str], difficulty: Optional[str] = None
+    ) -> List[str]:
+        with self._index_lock:
+            self.index.load()
+            table = self._weighted_table(difficulty)
+            if table is None:
+                if not exclude:
+                    positions = random.sample(range(len(self.index)), min(num_words, len(self.index)))
+                    return self._read_words(positions)
+                return self._sample_distinct(num_words, exclude, len(self.index), self._uniform_draw)
+            return self._sample_distinct(num_words, exclude, len(table), table.draw)
+
+    def _uniform_draw(self) -> int:
+        return random.randrange(len(self.index))
+
+    def _sample_distinct(
+        self,
+        num_words: int,
+        exclude: AbstractSet[str],
+        population: int,
+        draw: Callable[[], int],
+    ) -> List[str]:
+        """Draw distinct words outside ``exclude`` from ``population`` positions."""
+        selected: List[str] = []
+        skipped: List[str] = []
+        tried = set()
+        for _ in range(_MAX_SAMPLING_ROUNDS):
+            remaining = population - len(tried)
+            if len(selected) >= num_words or remaining <= 0:
+                break
+            wanted = min(remaining, 2 * (num_words - len(selected)))
+            positions = []
+            for _ in range(wanted * _MAX_DRAWS_PER_WORD):
+                if len(positions) >= wanted:
+                    break
+                position = draw()
+                if position not in tried:
+                    tried.add(position)
+                    positions.append(position)
+            for word in self._read_words(positions):
+                if word in exclude or word in selected:
+                    skipped.append(word)
+                elif len(selected) < num_words:
+                    selected.append(word)
+
+        # Prefer a repeated word over returning too few
+        for word in skipped:
+            if len(selected) >= num_words:
+                break
+            if word not in selected:
+                selected.append(word)
+        return selected
+
+    def _read_words(self, positions: List[int]) -> List[str]:
+        selected_words = []
+        with open(self.words_file_path, "rb") as f:
+            for position in positions:
+                f.seek(self.index.offset(position))
+                word = _normalize_word(f.readline())
+                if word is None:
+                    # The dictionary changed underneath the index
+                    raise WordSelectionError("Word index is out of date with the dictionary file")
+                selected_words.append(word)
+        return selected_words
@@ -0,0 +1,267 @@
+import mmap
+import os
+import random
+import struct
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .exceptions import ConfigurationError, WordSelectionError
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Alias cache layout: fixed header, then the acceptance probabilities
+# (doubles), the index positions they belong to and the alias slots.
+_ALIAS_MAGIC = b"RWBALS01"
+_ALIAS_HEADER = struct.Struct("<8sQQQQQQdQ")
+
+
+@dataclass(frozen=True)
+class DifficultyBand:
+    """A range of frequency ranks; ``max_rank`` of 0 leaves the band open-ended."""
+
+    name: str
+    min_rank: int
+    max_rank: int = 0
+
+    def contains(self, rank: int) -> bool:
+        return rank >= self.min_rank and (self.max_rank == 0 or rank < self.max_rank)
+
+
+def parse_difficulty_bands(spec: str) -> Dict[str, DifficultyBand]:
+    """
+    Parse ``WORD_DIFFICULTY_BANDS``.
+
+    The spec is a ``;``-separated list of ``name:min-max`` entries, where ranks
+    count from 1 for the most frequent word and an empty ``max`` leaves the
+    band open-ended (including words missing from the frequency list).
+
+    Raises:
+        ConfigurationError: If an entry cannot be parsed
+    """
+    bands: Dict[str, DifficultyBand] = {}
+    for entry in (part.strip() for part in spec.split(";")):
+        if not entry:
+            continue
+        name, _, ranks = entry.partition(":")
+        low, _, high = ranks.partition("-")
+        try:
+            band = DifficultyBand(name.strip(), int(low), int(high) if high.strip() else 0)
+        except ValueError as e:
+            raise ConfigurationError(f"Invalid difficulty band '{entry}': {e}")
+        if not band.name or band.min_rank < 1 or (band.max_rank and band.max_rank <= band.min_rank):
+            raise ConfigurationError(f"Invalid difficulty band '{entry}'")
+        bands[band.name] = band
+    return bands
+
+
+def load_frequency_ranks(path: str) -> Dict[str, int]:
+    """
+    Read a frequency list into a word to rank mapping.
+
+    Each line holds a word, optionally followed by a count. With counts the
+    words are ranked by count, otherwise by their order in the file.
+    """
+    entries: List[Tuple[str, float]] = []
+    has_counts = False
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line_number, line in enumerate(f):
+            fields = line.split()
+            if not fields:
+                continue
+            count = -line_number
+            if len(fields) > 1:
+                try:
+                    count = float(fields[1])
+                    has_counts = True
+                except ValueError:
+                    pass
+            entries.append((fields[0].lower(), count))
+
+    if has_counts:
+        entries.sort(key=lambda entry: entry[1], reverse=True)
+
+    ranks: Dict[str, int] = {}
+    for word, _ in entries:
+        ranks.setdefault(word, len(ranks) + 1)
+    return ranks
+
+
+def build_alias_table(weights: Sequence[float]) -> Tuple[array, array]:
+    """
+    Build Walker alias tables for ``weights`` using Vose's method.
+
+    Returns:
+        The acceptance probability and alias slot for every entry
+    """
+    count = len(weights)
+    total = float(sum(weights))
+    probabilities = array("d", (weight * count / total for weight in weights))
+    aliases = array("I", bytes(4 * count))
+
+    small = [i for i, probability in enumerate(probabilities) if probability < 1.0]
+    large = [i for i, probability in enumerate(probabilities) if probability >= 1.0]
+    while small and large:
+        lesser, greater = small.pop(), large.pop()
+        aliases[lesser] = greater
+        probabilities[greater] += probabilities[lesser] - 1.0
+        (small if probabilities[greater] < 1.0 else large).append(greater)
+
+    # Whatever is left is 1.0 up to rounding error
+    for index in small + large:
+        probabilities[index] = 1.0
+    return probabilities, aliases
+
+
+class WeightedWordTable:
+    """
+    Memory-mapped alias table for O(1) weighted draws of word index positions.
+
+    The table covers the words whose frequency rank falls in one difficulty
+    band, weighted by ``rank ** -exponent``. It is cached on disk and rebuilt
+    only when the dictionary, the frequency list or the band settings change.
+    """
+
+    def __init__(
+        self,
+        cache_path: str,
+        band: DifficultyBand,
+        frequency_path: str,
+        exponent: float = 0.0,
+    ):
+        self.cache_path = cache_path
+        self.band = band
+        self.frequency_path = frequency_path
+        self.exponent = exponent
+        self._fingerprint: Optional[tuple] = None
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._probabilities: Optional[memoryview] = None
+        self._positions: Optional[memoryview] = None
+        self._aliases: Optional[memoryview] = None
+
+    def __len__(self) -> int:
+        return len(self._positions) if self._positions is not None else 0
+
+    def draw(self) -> int:
+        """Return a word index position drawn in proportion to its weight."""
+        slot = random.randrange(len(self._positions))
+        if random.random() >= self._probabilities[slot]:
+            slot = self._aliases[slot]
+        return self._positions[slot]
+
+    def load(self, words_stat: os.stat_result, index_words: Callable[[], Iterable[str]]) -> None:
+        """
+        Map the cached table, rebuilding it first if any of its inputs changed.
+
+        Args:
+            words_stat: Stat of the dictionary file the word index was built from
+            index_words: Returns the indexed words in index order, used on rebuild
+        """
+        frequency_stat = os.stat(self.frequency_path)
+        fingerprint = (
+            words_stat.st_mtime_ns,
+            words_stat.st_size,
+            frequency_stat.st_mtime_ns,
+            frequency_stat.st_size,
+            self.band.min_rank,
+            self.band.max_rank,
+            self.exponent,
+        )
+        if self._positions is not None and fingerprint == self._fingerprint:
+            return
+
+        self.close()
+        if self._read_fingerprint() != fingerprint:
+            self._build(index_words(), fingerprint)
+        self._load_map(fingerprint)
+
+    def close(self) -> None:
+        """Release the memory map and file handle, if any."""
+        for view in (self._probabilities, self._positions, self._aliases):
+            if view is not None:
+                view.release()
+        self._probabilities = self._positions = self._aliases = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._fingerprint = None
+
+    def _read_fingerprint(self) -> Optional[tuple]:
+        try:
+            with open(self.cache_path, "rb") as f:
+                header = f.read(_ALIAS_HEADER.size)
+        except OSError:
+            return None
+
+        if len(header) != _ALIAS_HEADER.size:
+            return None
+        magic, *fingerprint, _ = _ALIAS_HEADER.unpack(header)
+        return tuple(fingerprint) if magic == _ALIAS_MAGIC else None
+
+    def _weighted_positions(self, words: Iterable[str]) -> Iterator[Tuple[int, float]]:
+        ranks = load_frequency_ranks(self.frequency_path)
+        unranked = len(ranks) + 1
+        for position, word in enumerate(words):
+            rank = ranks.get(word, unranked)
+            if self.band.contains(rank):
+                yield position, rank ** -self.exponent
+
+    def _build(self, words: Iterable[str], fingerprint: tuple) -> None:
+        positions = array("I")
+        weights = array("d")
+        for position, weight in self._weighted_positions(words):
+            positions.append(position)
+            weights.append(weight)
+
+        probabilities, aliases = build_alias_table(weights) if positions else (array("d"), array("I"))
+
+        cache_dir = os.path.dirname(self.cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_ALIAS_HEADER.pack(_ALIAS_MAGIC, *fingerprint, len(positions)))
+            probabilities.tofile(f)
+            positions.tofile(f)
+            aliases.tofile(f)
+        os.replace(tmp_path, self.cache_path)
+        logger.info(
+            "Built weighted word table", band=self.band.name, words=len(positions)
+        )
+
+    def _load_map(self, fingerprint: tuple) -> None:
+        self._file = open(self.cache_path, "rb")
+        if os.fstat(self._file.fileno()).st_size == _ALIAS_HEADER.size:
+            # An empty band cannot be memory-mapped past its header
+            self._file.close()
+            self._file = None
+            self._probabilities = memoryview(array("d"))
+            self._positions = memoryview(array("I"))
+            self._aliases = memoryview(array("I"))
+            self._fingerprint = fingerprint
+            return
+
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        count = _ALIAS_HEADER.unpack_from(self._map)[-1]
+        start = _ALIAS_HEADER.size
+        boundaries = []
+        for typecode in ("d", "I", "I"):
+            end = start + count * array(typecode).itemsize
+            boundaries.append((start, end, typecode))
+            start = end
+        if len(self._map) < start:
+            self.close()
+            raise WordSelectionError(f"Weighted word table at {self.cache_path} is truncated")
+
+        view = memoryview(self._map)
+        self._probabilities, self._positions, self._aliases = (
+            view[begin:end].cast(typecode) for begin, end, typecode in boundaries
+        )
+        view.release()
+        self._fingerprint = fingerprint